@@ -1,19 +1,23 @@
-import argparse
+import concurrent.futures
+import contextlib
 import json
 import logging
 import math
 import re
+import threading
 from abc import abstractmethod, ABC
-from typing import List, Any
+from typing import List, Any, Dict, Optional
 
 import requests
 import pandas as pd
 
 from accession_diff_analyzer.analyzer_dataclasses import OverviewMetrics, IDWatchdog, IDRegistry
-from compound_common.transport_clients.ebi_ftp_handler import EBIFTPHandler
+from compound_common.transport_clients.ebi_ftp_handler import EBIFTPHandler, EBIFTPHandlerPool
 from compound_common.doc_clients.xml_utils import XmlResponseUtils
 from compound_common.doc_clients.jinja_wrapper import JinjaWrapper
 from compound_common.config_classes import FTPConfig
+from compound_common.argparse_classes.parsers import ArgParsers
+from compound_common.session_utils import SessionUtils
 
 
 from compound_common.function_wrappers.checker_wrappers.file_write_exception_angel import (
@@ -32,33 +36,78 @@ class MAFProcessorBase(ABC):
     def process_maf(self, maf_object: Any) -> None:
         pass
 
+    def close(self) -> None:
+        """
+        Release anything held open for get_maf, once all MAFs have been fetched.
+        """
+        pass
+
 
 
 
 class DataFrameMAFProcessor(MAFProcessorBase):
-    def __init__(self, handler, ids: set, is_dud_fn, process_identifier_fn):
+    def __init__(self, handler, ids: set, duds: List[str], pool_size: int = 8):
         self.handler = handler
-        self._ids = set()
-        self.is_dud = is_dud_fn
-        self.process_identifier = process_identifier_fn
+        self.ids = ids
+        self.duds = duds
+        self._dud_pattern = "|".join(map(re.escape, duds))
+        # get_maf is called from several threads at once, and an ftplib connection can't be shared between threads, so
+        # ftp handlers are lent out of a pool of connections seeded with the given handler. Anything else is shared.
+        self._pool = (
+            EBIFTPHandlerPool(config=handler.config, size=pool_size, handler=handler)
+            if isinstance(handler, EBIFTPHandler)
+            else None
+        )
 
     def get_maf(self, maf: str, study: str) -> pd.DataFrame:
-        return self.handler.load_isa_file(isatab_file=maf, study=study)
+        with self._borrow_handler() as handler:
+            # only the database_identifier column is ever looked at, so don't parse the rest of the sheet
+            return handler.load_isa_file(
+                isatab_file=maf, study=study, usecols=["database_identifier"]
+            )
+
+    def _borrow_handler(self):
+        return self._pool.handler() if self._pool is not None else contextlib.nullcontext(self.handler)
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.close()
 
     def process_maf(self, maf_dataframe: pd.DataFrame) -> None:
-        if maf_dataframe is None:
+        """
+        Vectorised equivalent of running Analyzer.is_dud and Analyzer.process_identifier over every row of the
+        database_identifier column. The string matching is done with pandas str methods over the whole column rather
+        than row by row, and the resulting ChEBI ids are added to the shared ids set in bulk.
+        :param maf_dataframe: A single MAF sheet as a pandas dataframe
+        :return: N/A
+        """
+        if maf_dataframe is None or "database_identifier" not in maf_dataframe.columns:
             return
 
-        for _, row in maf_dataframe.iterrows():
-            identifier = row.get("database_identifier")
-            if not self.is_dud(identifier):
-                self.process_identifier(identifier)
+        identifiers = maf_dataframe["database_identifier"].dropna().astype(str)
+        identifiers = identifiers[
+            ~identifiers.str.contains(self._dud_pattern, regex=True)
+        ]
+        chebi = identifiers[identifiers.str.contains("CHEBI", regex=False)]
+        if chebi.empty:
+            return
+
+        multi_mask = chebi.str.count("CHEBI") > 1
+        split = chebi[multi_mask].str.split("|").explode()
+        self.ids.update(split[split.str.startswith("CHEBI")].tolist())
+        self.ids.update(chebi[~multi_mask].tolist())
+
 
 class MtblsUtilsMAFProcessor(MAFProcessorBase):
     def __init__(self):
         pass
 
 class Analyzer:
+    # deletion table for str.translate that drops everything but digits, IE CHEBI:1234 -> 1234
+    _non_digit_table = str.maketrans(
+        "", "", "".join(chr(c) for c in range(256) if not chr(c).isdigit())
+    )
+
     def __init__(
         self,
         session: requests.Session,
@@ -70,6 +119,7 @@ class Analyzer:
     ):
         self.handler = handler
         self.session = session
+        self.session.headers.update({"user_token": token})
         self.token = token
         self.j = jinja_wrapper
 
@@ -77,19 +127,25 @@ class Analyzer:
         self.bad_mafs = []
 
         self.duds = ["|", "unknown", "Unknown", "-", " "]
+        self._duds_set = frozenset(self.duds)
+        self._dud_re = re.compile("|".join(map(re.escape, self.duds)))
         self.debug = True
         self.limit = 10
+        self.thread_count = 10
+        self.ftp_thread_count = 8
+        self._overview_lock = threading.Lock()
         self.output_location = output_location
 
         self.chebi_complete_entity_url = (
             "http://www.ebi.ac.uk/webservices/chebi/2.0/test/getCompleteEntity?chebiId="
         )
+        self._is_primary_cache = {}
 
         self.maf_processor = maf_processor or DataFrameMAFProcessor(
             handler=self.handler,
             ids=self.ids,
-            is_dud_fn=self.is_dud,
-            process_identifier_fn=self.process_identifier,
+            duds=self.duds,
+            pool_size=self.ftp_thread_count,
         )
 
     def go(self):
@@ -99,24 +155,48 @@ class Analyzer:
         studies = json.loads(response.text)["content"]
 
         overview = OverviewMetrics(len(studies), 0, 0, 0, 0)
+        if self.debug:
+            studies = studies[: self.limit + 1]
+
+        # the file listings are independent http calls, so fetch them all concurrently up front.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.thread_count
+        ) as executor:
+            study_maf_files = list(
+                executor.map(
+                    lambda study: (
+                        study,
+                        self.get_list_of_maf_files_in_study(study, overview),
+                    ),
+                    studies,
+                )
+            )
 
-        for study in studies:
-            if overview.studies_processed > self.limit and self.debug:
-                break
-
-            print("____________________________________________________________________________")
-            print(f"Processing {study}")
-
-            maf_files = self.get_list_of_maf_files_in_study(study, overview)
-            for maf in maf_files:
+        # downloads happen across the pool, but processing stays on this thread so self.ids needs no locking.
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.ftp_thread_count
+        ) as executor:
+            futures = {
+                executor.submit(self.maf_processor.get_maf, maf["file"], study): (
+                    study,
+                    maf,
+                )
+                for study, maf_files in study_maf_files
+                for maf in maf_files
+            }
+            for future in concurrent.futures.as_completed(futures):
+                study, maf = futures[future]
+                print("____________________________________________________________________________")
+                print(f"Processing {maf['file']} from {study}")
                 try:
-                    maf_data = self.maf_processor.get_maf(maf["file"], study)
+                    maf_data = future.result()
                 except Exception as e:
                     self.bad_mafs.append(maf)
                     logging.exception(f"couldnt load {maf}")
                     continue
                 self.maf_processor.process_maf(maf_data)
                 overview.mafs_processed += 1
+        self.maf_processor.close()
 
         compound_list = self.session.get(
             "https://www.ebi.ac.uk/metabolights/ws/compounds/list"
@@ -139,15 +219,12 @@ class Analyzer:
         :return:
         """
         url = f"https://www.ebi.ac.uk:443/metabolights/ws/studies/{study}/files?include_raw_data=false"
-        headers = {"user_token": self.token}
-        self.session.headers = headers
 
         try:
             response = self.session.get(url)
         except ConnectionError as e:
             print(f"Could not get contents of study {study}: {str(e)}")
             return []
-        overview.studies_processed += 1
 
         maf_files = (
             [
@@ -158,7 +235,9 @@ class Analyzer:
             if response is not None
             else None
         )
-        overview.total_mafs += len(maf_files)
+        with self._overview_lock:
+            overview.studies_processed += 1
+            overview.total_mafs += len(maf_files)
         return maf_files
 
     def assemble_registries(self, compound_list) -> IDWatchdog:
@@ -168,9 +247,9 @@ class Analyzer:
         :return:
         """
         compound_list_numeric = {
-            re.sub(r"\D", "", compound) for compound in compound_list
+            compound.translate(self._non_digit_table) for compound in compound_list
         }
-        maf_list_numeric = {re.sub(r"\D", "", compound) for compound in self.ids}
+        maf_list_numeric = {compound.translate(self._non_digit_table) for compound in self.ids}
 
         ids_unique_to_mafs = self.get_delta(maf_list_numeric, compound_list_numeric)
         ids_unique_to_db = self.get_delta(compound_list_numeric, maf_list_numeric)
@@ -178,33 +257,35 @@ class Analyzer:
         maf_registry = IDRegistry(total=len(ids_unique_to_mafs))
         db_registry = IDRegistry(total=len(ids_unique_to_db))
 
-        for identifier in ids_unique_to_mafs:
-            maf_registry.primary.add(identifier) if self.is_primary(
-                identifier
-            ) else maf_registry.secondary.add(identifier) if self.is_primary(
-                identifier
-            ) is not None else maf_registry.incorrect.add(
-                identifier
-            )
+        primaries = self.resolve_primaries(list(ids_unique_to_mafs | ids_unique_to_db))
 
+        for identifier in ids_unique_to_mafs:
+            maf_registry.register(identifier, primaries[identifier])
         for identifier in ids_unique_to_db:
-            db_registry.primary.add(identifier) if self.is_primary(
-                identifier
-            ) else db_registry.secondary.add(identifier) if self.is_primary(
-                identifier
-            ) is not None else db_registry.incorrect.add(
-                identifier
-            )
+            db_registry.register(identifier, primaries[identifier])
 
         return IDWatchdog(maf=maf_registry, db=db_registry)
 
+    def resolve_primaries(self, identifiers: List[str]) -> Dict[str, Optional[bool]]:
+        """
+        Run is_primary for each identifier across a ThreadPoolExecutor, so that the ChEBI webservice calls are made
+        concurrently rather than one after the other.
+        :param identifiers: List of ChEBI ids to check.
+        :return: dict of id: result of is_primary for that id.
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.thread_count
+        ) as executor:
+            return dict(zip(identifiers, executor.map(self.is_primary, identifiers)))
+
     def is_primary(self, identifier: str) -> bool:
         """
         Check whether a given id is a primary id in ChEBI. Ping the ChEBI completeEntity endpoint, and if the ID in the
         response is the same as the one you queried, then the ID is primary (if the ID is secondary, the primary
         compound and its associated ID and other information is returned)
         :param identifier: string representation of ChEBI ID.
-        :return: bool indicating whether the present ID is primary or not.
+        :return: bool indicating whether the present ID is primary or not. Results are cached per id, so the
+            webservice is only hit once for any given id.
         """
         """"
         Two potential ways to check:
@@ -212,25 +293,30 @@ class Analyzer:
         - Consult the list of files within the local chebi_index directory (if and when it exists)
         """
 
+        if identifier in self._is_primary_cache:
+            return self._is_primary_cache[identifier]
+
         entity_response = self.session.get(
             f"{self.chebi_complete_entity_url}{identifier}"
         )
         chebi_webservice_id = XmlResponseUtils.get_chebi_id(entity_response.text)
 
-        return (
+        result = (
             identifier in chebi_webservice_id
             if chebi_webservice_id is not None
             else None
         )
+        self._is_primary_cache[identifier] = result
+        return result
 
-    def get_delta(self, subject: set, comparator: set) -> list:
+    def get_delta(self, subject: set, comparator: set) -> set:
         """
         Returns items in a subject set unique to the subject relative to a comparator
         :param subject: set of ids
         :param comparator: set of ids
-        :return: list of unique ids in subject
+        :return: set of unique ids in subject
         """
-        return list(subject - comparator)
+        return subject - comparator
 
     def get_maf(self, maf: str, study: str) -> pd.DataFrame:
         """
@@ -246,52 +332,52 @@ class Analyzer:
         """
         Process a maf in the form of a dataframe by going over each row, pulling out the database_identifier column
         entry and throwing that entry into a processing method (which also has a dud checking method in the same
-        ternary statement that it lives in)
+        ternary statement that it lives in). The CHEBI ids found are collected locally and added to self.ids in one go.
         :param maf_dataframe: A single MAF sheets as a pandas dataframe
         :return: N/A
         """
-        if maf_dataframe is None:
+        if maf_dataframe is None or "database_identifier" not in maf_dataframe.columns:
             return
-        for index, row in maf_dataframe.iterrows():
-            database_identifier = (
-                row["database_identifier"]
-                if "database_identifier" in row.keys()
-                else None
-            )
-            self.process_identifier(database_identifier) if not self.is_dud(
+        # itertuples avoids building a Series for every row, which iterrows does.
+        col_idx = maf_dataframe.columns.get_loc("database_identifier")
+        chebi_ids = []
+        for row in maf_dataframe.itertuples(index=False, name=None):
+            database_identifier = row[col_idx]
+            chebi_ids.extend(self.process_identifier(database_identifier)) if not self.is_dud(
                 database_identifier
             ) else None
+        self.ids.update(chebi_ids)
 
-    def process_identifier(self, identifier) -> None:
+    def process_identifier(self, identifier) -> List[str]:
         """
         Assess a single cell from the database_identifier column in a MAF sheet
         Currently we are only interested in CHEBI identifiers, we just log everything else, but we may want  to do
         something with the other identifiers / structural information that we sometimes find.
         :param identifier: entry from the database identifier column, could be one of several types.
-        :return: N/A but adds id to objects.ids list if it is a CHEBI id
+        :return: List of the CHEBI ids found in the entry, empty if there are none.
         """
         if isinstance(identifier, float) or isinstance(identifier, int):
             print(
                 f"Found non zero numeric identifier or structure descriptor {identifier}"
             )
-            
-        elif identifier.startswith("CHEBI") or identifier.count("CHEBI") > 0:
+            return []
+
+        if identifier.startswith("CHEBI") or identifier.count("CHEBI") > 0:
             if identifier.count("CHEBI") > 1:
-                identifiers = {
+                return [
                     ident
                     for ident in identifier.split("|")
                     if ident.startswith("CHEBI")
-                }
-                self.ids.update(identifiers)
-            else:
-                if any(dud in identifier for dud in self.duds):
-                    for dud in self.duds:
-                        identifier = identifier.replace(dud, "")
-                if len(identifier) > 12:
-                    print(identifier)
-                self.ids.add(identifier)
-        else:
-            print(identifier)
+                ]
+            if any(dud in identifier for dud in self.duds):
+                for dud in self.duds:
+                    identifier = identifier.replace(dud, "")
+            if len(identifier) > 12:
+                print(identifier)
+            return [identifier]
+
+        print(identifier)
+        return []
 
     def is_dud(self, identifier) -> bool:
         """
@@ -303,7 +389,7 @@ class Analyzer:
         """
         if identifier is None:
             return True
-        if identifier in self.duds:
+        if identifier in self._duds_set:
             return True
         if isinstance(identifier, float):
             if identifier == 0:
@@ -313,10 +399,8 @@ class Analyzer:
             if identifier == 0:
                 return True
             return math.isnan(identifier)
-        for dud in self.duds:
-            # this might seem strange, but catches cases like 'unknownId'
-            if dud in identifier:
-                return True
+        # this might seem strange, but catches cases like 'unknownId'
+        return self._dud_re.search(identifier) is not None
 
     @file_rw_exception_angel
     def save_report(
@@ -366,13 +450,12 @@ class Analyzer:
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser()
-    parser.add_argument("-t", "--token", help="MetaboLights API Token")
+    parser = ArgParsers.accession_diff_parser()
     args = parser.parse_args()
     token = args.token
 
     Analyzer(
-        session=requests.Session(),
+        session=SessionUtils.pooled_session(),
         handler=EBIFTPHandler(
             config=FTPConfig(
                 enabled=True,
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, Optional
 
 
 @dataclass
@@ -15,6 +15,35 @@ class IDRegistry:
     secondary: set = field(default_factory=set)
     incorrect: set = field(default_factory=set)
 
+    def register(self, identifier: str, is_primary: Optional[bool]) -> None:
+        """
+        File an identifier under primary, secondary or incorrect, given the result of an is_primary check.
+        :param identifier: ChEBI id.
+        :param is_primary: True if primary, False if secondary, None if ChEBI has no entry for the id.
+        :return: None
+        """
+        if is_primary:
+            self.primary.add(identifier)
+        elif is_primary is None:
+            self.incorrect.add(identifier)
+        else:
+            self.secondary.add(identifier)
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "IDRegistry":
+        """
+        Rebuild an IDRegistry from the output of dataclasses.asdict, IE after a round trip to json, where the sets will
+        have been written out as lists.
+        :param d: dict representation of an IDRegistry.
+        :return: IDRegistry object.
+        """
+        return cls(
+            total=d["total"],
+            primary=set(d["primary"]),
+            secondary=set(d["secondary"]),
+            incorrect=set(d["incorrect"]),
+        )
+
 
 @dataclass
 class IDRegistrySet:
@@ -26,6 +55,10 @@ class IDRegistrySet:
     maf: IDRegistry
     db: IDRegistry
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "IDRegistrySet":
+        return cls(maf=IDRegistry.from_dict(d["maf"]), db=IDRegistry.from_dict(d["db"]))
+
 
 @dataclass
 class DiffAnalyzerOverviewMetrics:
@@ -1,40 +1,65 @@
-import pickle
+import concurrent.futures
+import json
+import os
+import time
 from typing import Dict
 
 import requests
 
 from accession_diff_analyzer.analyzer_dataclasses import IDRegistrySet
 from accession_diff_analyzer.utils_analyzer import ReportedCompoundsStats, StudyBreakdown
+from compound_common.session_utils import SessionUtils
+
+RELEASE_DATES_MAX_CACHE_AGE = 7 * 24 * 60 * 60
 
 
 def main():
-    with open("../ephemeral/id_registry_set.pkl", "rb") as f:
-        id_reg: IDRegistrySet = pickle.load(f)
-    with open("../ephemeral/compound_statistics.pkl", "rb") as f:
-        stats: ReportedCompoundsStats = pickle.load(f)
+    with open("../ephemeral/id_registry_set.json", "r") as f:
+        id_reg: IDRegistrySet = IDRegistrySet.from_dict(json.load(f))
+    with open("../ephemeral/compound_statistics.json", "r") as f:
+        stats: ReportedCompoundsStats = ReportedCompoundsStats.from_dict(json.load(f))
     dates = get_public_release_dates()
     print('loaded')
 
-def get_public_release_dates() -> Dict[str, int]:
-    release_date_dict = {}
-    try:
-        with open("dates.pkl", "r") as rf:
-            release_date_dict: Dict[str, int] = pickle.load(rf)
-    except OSError as e:
-        print("dates file doesnt exist")
-
+def get_public_release_dates(
+    session: requests.Session = None,
+    cache_path: str = "dates.json",
+    max_cache_age: int = RELEASE_DATES_MAX_CACHE_AGE,
+) -> Dict[str, int]:
+    """
+    Get the public release date of every study. Results are cached to disk as json, and the cache is reused until it is
+    older than max_cache_age. Otherwise, the per-study lookups are made concurrently across a thread pool.
+    :param session: Session object to make http calls.
+    :param cache_path: Where to read / write the cached dates.
+    :param max_cache_age: Age in seconds after which the cache is refreshed.
+    :return: dict of study accession: public release date
+    """
+    if os.path.exists(cache_path) and time.time() - os.path.getmtime(cache_path) < max_cache_age:
+        with open(cache_path, "r") as rf:
+            return json.load(rf)
 
-    s = requests.Session()
+    s = session or SessionUtils.pooled_session()
     response = s.get("https://www.ebi.ac.uk:443/metabolights/ws/studies")
     study_list = response.json()["content"]
-    for study in study_list:
-        study_details_response = s.get(f"https://www.ebi.ac.uk:443/metabolights/ws/studies/public/study/{study}")
-        release_date = study_details_response.json()["content"]["studyPublicReleaseDate"]
-        release_date_dict.update({f"{study}": release_date})
-    with open("dates.pkl", "wb") as f:
-        pickle.dump(release_date_dict, f)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+        release_dates = executor.map(
+            lambda study: get_public_release_date(s, study), study_list
+        )
+        release_date_dict = dict(zip(study_list, release_dates))
+    with open(cache_path, "w") as f:
+        json.dump(release_date_dict, f)
     return release_date_dict
 
 
+def get_public_release_date(session: requests.Session, study: str) -> int:
+    """
+    Get the public release date of a single study from the MetaboLights webservice.
+    :param session: Session object to make http call.
+    :param study: Study accession, IE MTBLS1
+    :return: Public release date of the study.
+    """
+    study_details_response = session.get(f"https://www.ebi.ac.uk:443/metabolights/ws/studies/public/study/{study}")
+    return study_details_response.json()["content"]["studyPublicReleaseDate"]
+
 if __name__ == '__main__':
     main()
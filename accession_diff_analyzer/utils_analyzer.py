@@ -1,32 +1,34 @@
-import argparse
 import datetime
 import json
 import logging
 import pathlib
-import pickle
 import re
-from dataclasses import dataclass, fields, field
-from io import StringIO
-from typing import Optional, List, Set
+from dataclasses import asdict, dataclass, fields, field
+from itertools import chain
+from typing import Optional, List, Set, Dict
 
+import pandas as pd
 import requests
 
 from accession_diff_analyzer.analyzer_dataclasses import IDRegistrySet, IDRegistry, \
     DiffAnalyzerOverviewMetrics
 from compound_common.collectors.local_folder_metadata_collector import LocalFolderMetadataCollector
 from compound_common.doc_clients.jinja_wrapper import JinjaWrapper
+from compound_common.argparse_classes.parsers import ArgParsers
+from compound_common.session_utils import SessionUtils
 from metabolights_utils.models.metabolights.model import (
     MetabolightsStudyModel,
 )
-from metabolights_utils.isatab import Reader
 
 from metabolights_utils.provider.study_provider import (
     MetabolightsStudyProvider,
 )
-from metabolights_utils.isatab.reader import IsaTableFileReader, IsaTableFileReaderResult
 
 from compound_common.doc_clients.xml_utils import XmlResponseUtils
 
+# an alternate, non-ChEBI database identifier, like HMDB0000001 or LMFA:123
+ALTERNATE_ID_PATTERN = r'^[a-zA-Z]{1,10}:?[0-9]{1,10}$'
+
 
 @dataclass
 class Compound:
@@ -61,6 +63,10 @@ class StudyBreakdown:
     has_inchi: set[str] = field(default_factory=set)
     has_chemical_formulae: set[str] = field(default_factory=set)
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "StudyBreakdown":
+        return cls(**{key: set(value) for key, value in d.items()})
+
 @dataclass
 class MAFBreakdown:
     study_id: str
@@ -68,32 +74,59 @@ class MAFBreakdown:
     alternate: List[Compound] = field(default_factory=list)
     no_id: List[Compound] = field(default_factory=list)
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "MAFBreakdown":
+        return cls(
+            study_id=d["study_id"],
+            chebi=[Compound(**c) for c in d["chebi"]],
+            alternate=[Compound(**c) for c in d["alternate"]],
+            no_id=[Compound(**c) for c in d["no_id"]],
+        )
+
 @dataclass
 class ReportedCompoundsStats:
     study: StudyBreakdown = field(default_factory=StudyBreakdown)
     maf: List[MAFBreakdown] = field(default_factory=list)
 
+    @classmethod
+    def from_dict(cls, d: dict) -> "ReportedCompoundsStats":
+        """
+        Rebuild a ReportedCompoundsStats object from the output of dataclasses.asdict, IE after a round trip to json.
+        :param d: dict representation of a ReportedCompoundsStats object.
+        :return: ReportedCompoundsStats object.
+        """
+        return cls(
+            study=StudyBreakdown.from_dict(d["study"]),
+            maf=[MAFBreakdown.from_dict(mb) for mb in d["maf"]],
+        )
+
 
 class UtilsAnalyzer:
+    # deletion table for str.translate that drops everything but digits, IE CHEBI:1234 -> 1234
+    _non_digit_table = str.maketrans(
+        "", "", "".join(chr(c) for c in range(256) if not chr(c).isdigit())
+    )
 
     def __init__(
             self,
-            session: requests.Session = requests.Session(),
+            session: requests.Session = None,
             token: str = None,
             jinja_wrapper: JinjaWrapper = JinjaWrapper(),
             output_location: str = "./ephemeral/",
             study_root_path: str = None
                  ):
-        self.session = session
+        self.session = session or SessionUtils.pooled_session()
         self.token = token
         self.jinja_wrapper = jinja_wrapper
         self.output_location = output_location
         self.study_root_path = study_root_path
 
         self.duds = ["|", "unknown", "Unknown", "-", " "]
+        self._dud_re = re.compile("|".join(map(re.escape, self.duds)))
         self.chebi_complete_entity_url = (
             "http://www.ebi.ac.uk/webservices/chebi/2.0/test/getCompleteEntity?chebiId="
         )
+        self._is_primary_cache = {}
 
     def go(self):
         """Process a study -> process each MAF in a study -> process each page in a MAF -> process each row on page"""
@@ -140,67 +173,80 @@ class UtilsAnalyzer:
             ]
         )
         # do some saving or plotting from here
-        with open("ephemeral/compound_statistics.pkl", "wb") as f:
-            pickle.dump(rcs, f)
-        with open("ephemeral/id_registry_set.pkl", "wb") as f:
-            pickle.dump(registry_set, f)
+        # sets aren't json serializable, so they are written out as lists
+        with open("ephemeral/compound_statistics.json", "w") as f:
+            json.dump(asdict(rcs), f, default=list)
+        with open("ephemeral/id_registry_set.json", "w") as f:
+            json.dump(asdict(registry_set), f, default=list)
         print(overview)
 
     def process_maf(self, study: str, maf: str, valid_fields: Set[str], mb: MAFBreakdown) -> MAFBreakdown:
+        """
+        Parse a MAF sheet once, keeping only the columns that map onto the Compound dataclass, and classify each row.
+        :param study: Study accession, IE MTBLS1
+        :param maf: Filename of the MAF sheet within the study folder.
+        :param valid_fields: Names of the fields on the Compound dataclass.
+        :param mb: The MAFBreakdown for this study, which is updated in place.
+        :return: The updated MAFBreakdown
+        """
         file_path = pathlib.Path(f'{self.study_root_path}/{study}/{maf}')
-        reader: IsaTableFileReader = Reader.get_assignment_file_reader()
-        with open(file_path, "r") as f:
-            file_contents = f.read()
-
-        def make_buffer() -> StringIO:
-            buf = StringIO(file_contents)
-            buf.name = str(file_path)
-            return buf
-
-        page_count = reader.get_total_pages(file_buffer_or_path=make_buffer())
-        for page in range(1, page_count + 1):
-            result: IsaTableFileReaderResult = reader.get_page(
-                file_buffer_or_path=make_buffer(),
-                page=page,
-            )
-
-            num_rows = len(next(iter(result.isa_table_file.table.data)))
-            num_rows = result.isa_table_file.table.row_count
-            for i in range(num_rows):
-                row_values = {
-                    key: col[i]
-                    for key, col in result.isa_table_file.table.data.items()
-                    if key in valid_fields and col[i] not in ("", None)
-                }
-                compound_row = Compound(**row_values)
-                mb = self.process_row(compound_row, mb, self.duds)
-        return mb
+        header = pd.read_csv(file_path, sep="\t", nrows=0).columns
+        maf_dataframe = pd.read_csv(
+            file_path,
+            sep="\t",
+            usecols=[column for column in header if column in valid_fields],
+            dtype=str,
+            keep_default_na=False,
+        )
+        return self.classify_maf(maf_dataframe, mb, self._dud_re)
 
     @staticmethod
-    def process_row(compound_row: Compound, maf_breakdown: MAFBreakdown, duds: List[str]) -> MAFBreakdown:
-        pattern = r'^[a-zA-Z]{1,10}:?[0-9]{1,10}$'
-        if compound_row.isnumber():
-            maf_breakdown.alternate.append(compound_row)
-            return maf_breakdown
-        if 'CHEBI' in compound_row.database_identifier:
-            maf_breakdown.chebi.append(compound_row)
-            return maf_breakdown
-        if compound_row.database_identifier is None:
-            maf_breakdown.no_id.append(compound_row)
-            return maf_breakdown
-        if compound_row.database_identifier is '':
-            maf_breakdown.no_id.append(compound_row)
-            return maf_breakdown
-        if any(dud in compound_row.database_identifier for dud in duds):
-            maf_breakdown.no_id.append(compound_row)
-            return maf_breakdown
-        if re.search(pattern, compound_row.database_identifier):
-            # assume this is an alternate identifier
-            maf_breakdown.alternate.append(compound_row)
-            return maf_breakdown
-        print(f"Unexpected entry in database_identifier column: {compound_row.database_identifier}")
-        raise ValueError
+    def classify_maf(maf_dataframe: pd.DataFrame, maf_breakdown: MAFBreakdown, dud_re: re.Pattern) -> MAFBreakdown:
+        """
+        Sort every row of a MAF sheet into the chebi / alternate / no_id lists of the breakdown using boolean masks over
+        the database_identifier column. In order of precedence, an identifier is:
+          - alternate if it is a number, by the same rule as Compound.isnumber (so 'nan' and '1_000' count)
+          - chebi if it contains CHEBI
+          - no_id if it is empty or contains a dud entry
+          - alternate if it matches ALTERNATE_ID_PATTERN
+        Anything else is unexpected, and raises a ValueError.
+        :param maf_dataframe: MAF sheet as a dataframe of strings, with empty cells as ''.
+        :param maf_breakdown: MAFBreakdown to update.
+        :param dud_re: Compiled pattern matching any dud entry.
+        :return: The updated MAFBreakdown
+        """
+        if "database_identifier" in maf_dataframe.columns:
+            identifiers = maf_dataframe["database_identifier"]
+        else:
+            identifiers = pd.Series("", index=maf_dataframe.index)
+
+        numeric = identifiers.map(lambda value: Compound(database_identifier=value).isnumber()).astype(bool)
+        chebi = ~numeric & identifiers.str.contains("CHEBI", regex=False)
+        remaining = ~(numeric | chebi)
+        no_id = remaining & ((identifiers == "") | identifiers.str.contains(dud_re))
+        remaining &= ~no_id
+        alternate = numeric | (remaining & identifiers.str.match(ALTERNATE_ID_PATTERN))
+        unexpected = remaining & ~alternate
+        if unexpected.any():
+            print(f"Unexpected entry in database_identifier column: {identifiers[unexpected].iloc[0]}")
+            raise ValueError
+
+        maf_breakdown.chebi.extend(UtilsAnalyzer.dataframe_to_compounds(maf_dataframe[chebi]))
+        maf_breakdown.alternate.extend(UtilsAnalyzer.dataframe_to_compounds(maf_dataframe[alternate]))
+        maf_breakdown.no_id.extend(UtilsAnalyzer.dataframe_to_compounds(maf_dataframe[no_id]))
+        return maf_breakdown
 
+    @staticmethod
+    def dataframe_to_compounds(maf_dataframe: pd.DataFrame) -> List[Compound]:
+        """
+        Build a Compound for each row of a MAF dataframe, leaving empty cells to take the dataclass defaults.
+        :param maf_dataframe: MAF sheet as a dataframe of strings, restricted to Compound fields.
+        :return: List of Compound objects.
+        """
+        return [
+            Compound(**{key: value for key, value in record.items() if value != ""})
+            for record in maf_dataframe.to_dict(orient="records")
+        ]
 
     def load_study(self, study_path: str) -> MetabolightsStudyModel:
         number = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%d%H%M%S")
@@ -227,9 +273,9 @@ class UtilsAnalyzer:
         :return:
         """
         compound_list_numeric = {
-            re.sub(r"\D", "", compound) for compound in compound_list
+            compound.translate(self._non_digit_table) for compound in compound_list
         }
-        maf_list_numeric = {re.sub(r"\D", "", compound) for compound in maf_ids}
+        maf_list_numeric = {compound.translate(self._non_digit_table) for compound in maf_ids}
 
         ids_unique_to_mafs = self.get_delta(maf_list_numeric, compound_list_numeric)
         ids_unique_to_db = self.get_delta(compound_list_numeric, maf_list_numeric)
@@ -238,22 +284,9 @@ class UtilsAnalyzer:
         db_registry = IDRegistry(total=len(ids_unique_to_db))
 
         for identifier in ids_unique_to_mafs:
-            maf_registry.primary.add(identifier) if self.is_primary(
-                identifier
-            ) else maf_registry.secondary.add(identifier) if self.is_primary(
-                identifier
-            ) is not None else maf_registry.incorrect.add(
-                identifier
-            )
-
+            maf_registry.register(identifier, self.is_primary(identifier))
         for identifier in ids_unique_to_db:
-            db_registry.primary.add(identifier) if self.is_primary(
-                identifier
-            ) else db_registry.secondary.add(identifier) if self.is_primary(
-                identifier
-            ) is not None else db_registry.incorrect.add(
-                identifier
-            )
+            db_registry.register(identifier, self.is_primary(identifier))
 
         return IDRegistrySet(maf=maf_registry, db=db_registry)
 
@@ -263,7 +296,8 @@ class UtilsAnalyzer:
         response is the same as the one you queried, then the ID is primary (if the ID is secondary, the primary
         compound and its associated ID and other information is returned)
         :param identifier: string representation of ChEBI ID.
-        :return: bool indicating whether the present ID is primary or not.
+        :return: bool indicating whether the present ID is primary or not. Results are cached per id, so the
+            webservice is only hit once for any given id.
         """
         """"
         Two potential ways to check:
@@ -274,62 +308,56 @@ class UtilsAnalyzer:
         # requests if the flag is enabled, so it is disabled by default.
         if not enabled:
             return True
+        if identifier in self._is_primary_cache:
+            return self._is_primary_cache[identifier]
+
         entity_response = self.session.get(
             f"{self.chebi_complete_entity_url}{identifier}"
         )
         chebi_webservice_id = XmlResponseUtils.get_chebi_id(entity_response.text)
 
-        return (
+        result = (
             identifier in chebi_webservice_id
             if chebi_webservice_id is not None
             else None
         )
+        self._is_primary_cache[identifier] = result
+        return result
 
     @staticmethod
-    def get_delta(subject: set, comparator: set) -> list:
+    def get_delta(subject: set, comparator: set) -> set:
         """
         Returns items in a subject set unique to the subject relative to a comparator
         :param subject: set of ids
         :param comparator: set of ids
-        :return: list of unique ids in subject
+        :return: set of unique ids in subject
         """
-        return list(subject - comparator)
+        return subject - comparator
 
     @staticmethod
     def deduplicate_by_database_identifier(compounds: List[Compound]) -> List[Compound]:
-        seen = set()
-        unique = []
+        unique: Dict[str, Compound] = {}
         for compound in compounds:
-            db_id = compound.database_identifier
-            if db_id not in seen:
-                seen.add(db_id)
-                unique.append(compound)
-        return unique
+            # setdefault keeps the first compound seen for each id, in the order first seen
+            unique.setdefault(compound.database_identifier, compound)
+        return list(unique.values())
 
     @staticmethod
     def deduplicate_many(compound_lists: List[List[Compound]]) -> List[Compound]:
-        seen: Set[str] = set()
-        result: List[Compound] = []
-
-        for compound_list in compound_lists:
-            for compound in compound_list:
-                db_id = compound.database_identifier
-                if db_id and db_id not in seen:
-                    seen.add(db_id)
-                    result.append(compound)
-
-        return result
+        unique: Dict[str, Compound] = {}
+        for compound in chain.from_iterable(compound_lists):
+            if compound.database_identifier:
+                unique.setdefault(compound.database_identifier, compound)
+        return list(unique.values())
 
 
 if __name__ == '__main__':
-    parser = argparse.ArgumentParser()
-    parser.add_argument("-t", "--token", help="MetaboLights API Token")
-    parser.add_argument("-s", "--study-root", help="Absolute path to study root")
+    parser = ArgParsers.utils_accession_diff_parser()
     args = parser.parse_args()
     token = args.token
     study_root = args.study_root
     UtilsAnalyzer(
-        session=requests.Session(),
+        session=SessionUtils.pooled_session(),
         token=token,
         study_root_path=study_root
     ).go()
\ No newline at end of file
@@ -1,9 +1,4 @@
-from accession_diff_analyzer.analyzer import Analyzer
-from compound_common.argparse_classes import ArgParsers
-import requests
-
-from compound_common.transport_clients.ebi_ftp_handler import EBIFTPHandler
-from compound_common.config_classes import FTPConfig
+from compound_common.argparse_classes.parsers import ArgParsers
 
 
 def main(args):
@@ -11,8 +6,14 @@ def main(args):
     args = parser.parse_args(args)
     token = args.token
 
+    # deferred until after argument parsing, so that --help and bad arguments don't pay for importing pandas et al
+    from accession_diff_analyzer.analyzer import Analyzer
+    from compound_common.config_classes import FTPConfig
+    from compound_common.session_utils import SessionUtils
+    from compound_common.transport_clients.ebi_ftp_handler import EBIFTPHandler
+
     Analyzer(
-        session=requests.Session(),
+        session=SessionUtils.pooled_session(),
         handler=EBIFTPHandler(
             config=FTPConfig(
                 enabled=True,
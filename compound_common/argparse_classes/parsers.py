@@ -1,14 +1,17 @@
 import argparse
+import functools
 
 from compound_common.argparse_classes.actions.readable_dir import ReadableDir
 
 
 class ArgParsers:
     """
-    Collection of argparsers
+    Collection of argparsers. Each parser is built once and then reused, so callers must not add arguments to the
+    parsers they are handed.
     """
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def compound_builder_parser() -> argparse.ArgumentParser:
         """
         Compound builder arg parser.
@@ -56,9 +59,22 @@ class ArgParsers:
                             "--database",
                             action="store_true",
                             help="save compounds to database rather than to filesystem")
+        parser.add_argument(
+            "-p",
+            "--processes",
+            type=int,
+            default=1,
+            help="number of worker processes to build compounds across. Debug stats are only kept with one process",
+        )
+        parser.add_argument(
+            "-cc",
+            "--chebi_cache",
+            help="directory to cache ChEBI API responses in between runs. Responses are not cached if not given",
+        )
         return parser
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def compound_queue_parser() -> argparse.ArgumentParser:
         """
         Compound queue parser. First argument is to take in the config file for the redis client, which is purely
@@ -81,6 +97,7 @@ class ArgParsers:
         return parser
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def mapping_file_builder_parser() -> argparse.ArgumentParser:
         """
         Mapping file builder parser. Has a single argument, which is a path to a config file for the mapping file
@@ -96,6 +113,7 @@ class ArgParsers:
         return parser
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def redis_config_parser() -> argparse.ArgumentParser:
         parser = argparse.ArgumentParser()
         parser.add_argument(
@@ -106,6 +124,7 @@ class ArgParsers:
         return parser
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def reactome_parser() -> argparse.ArgumentParser:
         parser = argparse.ArgumentParser()
         parser.add_argument(
@@ -116,12 +135,40 @@ class ArgParsers:
         return parser
 
     @staticmethod
-    def accession_diff_parser() -> argparse.ArgumentParser:
-        parser = argparse.ArgumentParser()
+    @functools.lru_cache(maxsize=1)
+    def mtbls_token_parser() -> argparse.ArgumentParser:
+        """
+        Parent parser holding the MetaboLights API token argument, to be shared with other parsers via parents=[...]
+        rather than each of them redefining it.
+        :return: instantiated ArgumentParser, without a help argument.
+        """
+        parser = argparse.ArgumentParser(add_help=False)
         parser.add_argument("-t", "--token", help="MetaboLights API Token")
         return parser
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def accession_diff_parser() -> argparse.ArgumentParser:
+        """
+        Parser for the accession diff analyzer, which takes just the MetaboLights API token.
+        :return: instantiated ArgumentParser
+        """
+        parser = argparse.ArgumentParser(parents=[ArgParsers.mtbls_token_parser()])
+        return parser
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def utils_accession_diff_parser() -> argparse.ArgumentParser:
+        """
+        Parser for the accession diff analyzer that reads studies from a local folder rather than from ftp.
+        :return: instantiated ArgumentParser
+        """
+        parser = argparse.ArgumentParser(parents=[ArgParsers.mtbls_token_parser()])
+        parser.add_argument("-s", "--study-root", help="Absolute path to study root")
+        return parser
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
     def mongo_to_elastic_parser():
         parser = argparse.ArgumentParser(
             description="Project Mongo compounds into Elasticsearch index"
@@ -1,5 +1,5 @@
 from compound_common.config_classes.builder_config_files import MtblsWsUrls
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from reference_file_builders.mapping_file_builder.mapping_file_builder_enums import (
     PersistenceEnum,
@@ -7,7 +7,8 @@ from reference_file_builders.mapping_file_builder.mapping_file_builder_enums imp
 
 
 class MappingFileBuilderConfig(BaseModel):
-    mtbls_ws: MtblsWsUrls = MtblsWsUrls()
+    # a factory rather than a shared instance, which pydantic would otherwise deepcopy for every new config
+    mtbls_ws: MtblsWsUrls = Field(default_factory=MtblsWsUrls)
     timeout: int = 500
     thread_count: int = 6
     debug: bool = False
@@ -0,0 +1,24 @@
+from typing import Any
+
+
+class DictUtils:
+    """
+    Collection of static dict / JSON access methods
+    """
+
+    @staticmethod
+    def dig(d: Any, *keys: str, default: Any = None) -> Any:
+        """
+        Walk down a nested dict one key at a time, IE dig(data, "names", "SYNONYM") for data["names"]["SYNONYM"]. If any
+        key is missing, any value on the way is None or anything that isn't a dict is hit before the last key, the
+        default is returned instead of raising.
+        :param d: Nested dict to walk.
+        :param keys: Keys to follow, in order.
+        :param default: Value to return if the path can't be followed, or leads to None.
+        :return: Value at the end of the path, or the default.
+        """
+        for key in keys:
+            d = d.get(key) if isinstance(d, dict) else None
+            if d is None:
+                return default
+        return d
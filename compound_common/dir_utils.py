@@ -1,4 +1,5 @@
 import os
+import sys
 from typing import List
 
 
@@ -10,12 +11,10 @@ class DirUtils:
     @staticmethod
     def get_mtblc_ids_from_directory(directory: str) -> List[str]:
         """
-        Get a list of directories from a given directory.
+        Get a list of directories from a given directory. The names are interned, so that when they are compared
+        against the (also interned) ids from the webservice, equal ids are the same object and match on identity.
         :param directory: Directory to search through.
         :return: List of directories, as strings.
         """
-        list_of_ids = []
-        for entry in os.scandir(directory):
-            if entry.is_dir():
-                list_of_ids.append(entry.name)
-        return list_of_ids
+        with os.scandir(directory) as entries:
+            return [sys.intern(entry.name) for entry in entries if entry.is_dir()]
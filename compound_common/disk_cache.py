@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Any
+
+
+class DiskCache:
+    """
+    Minimal filesystem cache of json serializable values, that persists between runs. Each value is kept in its own
+    file named by the sha256 of its key, and is written to a temporary file first and then moved into place, so several
+    processes can share a cache directory safely. Entries older than the ttl are treated as missing.
+    """
+
+    def __init__(self, root: str, ttl: int = 7 * 86400):
+        """
+        :param root: Directory to keep the cache in. Created if it doesn't already exist.
+        :param ttl: Number of seconds an entry stays fresh for.
+        """
+        self.root = root
+        self.ttl = ttl
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        Get the value cached for a given key.
+        :param key: Key the value was cached under.
+        :param default: Value to return if there is no fresh entry for the key.
+        :return: The cached value, or the default.
+        """
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                return default
+            with open(path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return default
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Cache a value under a given key, replacing anything already cached for it.
+        :param key: Key to cache the value under.
+        :param value: json serializable value to cache.
+        :return: None
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            os.unlink(temp_path)
+            raise
@@ -1,4 +1,15 @@
-from jinja2 import Environment, FileSystemLoader
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+# One environment shared by every wrapper, so a template compiled for one is reused by all of them. Templates don't
+# change over the lifetime of a run, so auto_reload is off to skip the stat() on every get_template call, and compiled
+# templates are also kept in a bytecode cache on disk (in the system temp dir) so later runs skip the compile step.
+_ENV = Environment(
+    loader=FileSystemLoader("templates"),
+    bytecode_cache=FileSystemBytecodeCache(),
+    autoescape=select_autoescape(),
+    cache_size=400,
+    auto_reload=False,
+)
 
 
 class JinjaWrapper:
@@ -7,16 +18,20 @@ class JinjaWrapper:
     """
 
     def __init__(self):
-        self.env = Environment(loader=FileSystemLoader("templates"))
+        self.env = _ENV
         self.template = None
+        self.template_path = None
 
     def load_template(self, template_path):
         """
-        Load a given jinja template.
+        Load a given jinja template. If the given template is already loaded, this is a no-op.
         :param template_path: Path to given template
         :return: Loaded jinja template.
         """
+        if self.template is not None and self.template_path == template_path:
+            return
         self.template = self.env.get_template(template_path)
+        self.template_path = template_path
 
     def render_template(self, variables_yaml):
         """
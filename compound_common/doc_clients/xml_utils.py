@@ -1,4 +1,31 @@
-import xml.etree.ElementTree as ET
+import io
+from collections import deque
+
+try:
+    # lxml does the parsing and tree walking in C, so prefer it where it is available
+    from lxml import etree as ET
+
+    _PARSER = ET.XMLParser(huge_tree=False, collect_ids=False)
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    _PARSER = None
+
+_CHEBI_ID_TAG = "{https://www.ebi.ac.uk/webservices/chebi}chebiId"
+
+
+def _fromstring(response_text):
+    """
+    Parse a string into an element with whichever parser is available. lxml refuses str input that has an encoding
+    declaration, so in that case the text is passed to it as bytes.
+    :param response_text: string to parse
+    :return: Element object.
+    """
+    if _PARSER is None:
+        return ET.fromstring(response_text)
+    if isinstance(response_text, str):
+        response_text = response_text.encode("utf-8")
+    return ET.fromstring(response_text, parser=_PARSER)
 
 
 class XmlResponseUtils:
@@ -13,36 +40,28 @@ class XmlResponseUtils:
         :param response_text: string to convert
         :return: Element object.
         """
-        return ET.fromstring(response_text)
+        return _fromstring(response_text)
 
     @staticmethod
     def get_chebi_id(response_text) -> str:
         """
-        Extract a ChEBI ID from a stringified version of an XML response. Chain calls Element.find until it finds the
-        chebiID element (or not).
+        Extract a ChEBI ID from a stringified version of an XML response. The response is parsed as a stream and parsing
+        stops as soon as the chebiId element closes, which is near the top of a getCompleteEntity response, so the rest
+        of the envelope is never parsed.
         :param response_text: Stringified version of XML response.
         :return: ChEBI ID
         """
-        chebi_ns_map: dict = {
-            "envelop": "http://schemas.xmlsoap.org/soap/envelope/",
-            "chebi": "{http://www.ebi.ac.uk/webservices/chebi}",
-        }
         id = None
+        if isinstance(response_text, str):
+            response_text = response_text.encode("utf-8")
         try:
-            root = (
-                ET.fromstring(response_text)
-                .find("envelop:Body", namespaces=chebi_ns_map)
-                .find(
-                    "{https://www.ebi.ac.uk/webservices/chebi}getCompleteEntityResponse"
-                )
-                .find("{https://www.ebi.ac.uk/webservices/chebi}return")
-            )
-
-            id = root.find("{https://www.ebi.ac.uk/webservices/chebi}chebiId").text
+            for _, element in ET.iterparse(io.BytesIO(response_text), events=("end",)):
+                if element.tag == _CHEBI_ID_TAG:
+                    id = element.text
+                    break
+                element.clear()
         except ET.ParseError as e:
             print(f"XML parsing error occurred: {str(e)}")
-        except AttributeError as e:
-            print(f"Attribute error while calling .find on xml document: {str(e)}")
         return id
 
     @staticmethod
@@ -56,13 +75,23 @@ class XmlResponseUtils:
         if len(element) == 0:
             return element.text
         result = {}
-        for child in element:
-            child_data = XmlResponseUtils.element_to_dict(child)
-            if child.tag in result:
-                if type(result[child.tag]) is list:
-                    result[child.tag].append(child_data)
+        # walk the tree with an explicit stack rather than recursing. Each child is filed into its parents dict as soon
+        # as the parent is visited, so siblings keep their document order even though the stack is LIFO. Every child
+        # goes into a list under its tag, and lists with only one entry are unwrapped once the walk is done.
+        dicts = [result]
+        stack = deque([(element, result)])
+        while stack:
+            parent, parent_dict = stack.pop()
+            for child in parent:
+                if len(child) == 0:
+                    child_data = child.text
                 else:
-                    result[child.tag] = [result[child.tag], child_data]
-            else:
-                result[child.tag] = child_data
+                    child_data = {}
+                    dicts.append(child_data)
+                    stack.append((child, child_data))
+                parent_dict.setdefault(child.tag, []).append(child_data)
+        for d in dicts:
+            for tag, children in d.items():
+                if len(children) == 1:
+                    d[tag] = children[0]
         return result
@@ -7,40 +7,39 @@ def compound_debug_harness(enabled=False):
     """
     Function wrapper to capture the results of builder_compound_dir.build, and update various debug statistics, and then
     return the results.
-    :param enabled: Whether the debug mode is actually enabled. If not, just return the function execution.
+    :param enabled: Whether the debug mode is actually enabled. If not, the function is returned unwrapped.
     :return: decorator
     """
 
     def decorator(func):
+        if not enabled:
+            # nothing to record, so hand back the function itself rather than paying for a wrapper on every call
+            return func
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            if not enabled:
-                return func(*args, **kwargs)
-            else:
-                result = func(*args, **kwargs)
-                try:
-                    stats.increment("total_compounds")
-                    if "spectra" in result:
-                        stats.increment("compounds_with_ms") if len(
-                            result["spectra"].get("MS", [])
-                        ) > 0 else None
-                        stats.increment("total_ms_files", len(result["spectra"].get("MS", [])))
-                        stats.increment("compounds_with_nmr") if len(
-                            result["spectra"].get("NMR", [])
-                        ) > 0 else None
-                        stats.increment("total_nmr_files", len(result["spectra"].get("NMR", [])))
-                    if "pathways" in result:
-                        stats.increment("wiki") if len(
-                            result["pathways"].get("WikiPathways", [])
-                        ) > 0 else None
-                        stats.increment("reactomepathways") if len(
-                            result["pathways"].get("ReactomePathways", [])
-                        ) > 0 else None
-                except KeyError as e:
-                    print(f"KeyError encountered: {e}")
-                print(f"Total: {stats.count_total_compounds}")
-                return result
+            result = func(*args, **kwargs)
+            try:
+                stats.increment("total_compounds")
+                if "spectra" in result:
+                    ms_files = len(result["spectra"].get("MS", []))
+                    nmr_files = len(result["spectra"].get("NMR", []))
+                    stats.increment("compounds_with_ms") if ms_files > 0 else None
+                    stats.increment("total_ms_files", ms_files)
+                    stats.increment("compounds_with_nmr") if nmr_files > 0 else None
+                    stats.increment("total_nmr_files", nmr_files)
+                if "pathways" in result:
+                    stats.increment("wiki") if len(
+                        result["pathways"].get("WikiPathways", [])
+                    ) > 0 else None
+                    stats.increment("reactomepathways") if len(
+                        result["pathways"].get("ReactomePathways", [])
+                    ) > 0 else None
+            except KeyError as e:
+                print(f"KeyError encountered: {e}")
+            print(f"Total: {stats.count_total_compounds}")
+            return result
 
         return wrapper
 
-    return decorator
\ No newline at end of file
+    return decorator
@@ -4,7 +4,8 @@ from functools import wraps
 def dict_exception_angel(func):
     """
     Wrapper to swallow and report dictionary / JSON access errors.
-    Use sparingly where failure should not halt the script.
+    Use sparingly where failure should not halt the script. The wrapped function returns None on failure, so it is
+    no good for per-record accessors or chained calls - use DictUtils.dig with explicit None checks there instead.
     """
 
     @wraps(func)
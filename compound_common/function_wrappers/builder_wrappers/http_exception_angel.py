@@ -1,7 +1,7 @@
 import json
 import logging
 from functools import wraps
-from requests.exceptions import SSLError, ConnectionError, HTTPError, Timeout
+from requests.exceptions import SSLError, ConnectionError, HTTPError, RequestException, Timeout
 
 
 def http_exception_angel(func):
@@ -39,5 +39,9 @@ def http_exception_angel(func):
             print(
                 f"JSONDecode error in {str(func)} args:{args} kwargs{kwargs}: {str(e)}"
             )
+        except RequestException as e:
+            # anything else requests can raise, IE a RetryError from a pooled session's retry policy
+            print(f"Request failed when processing http request : {str(e)}")
+            print(f"args: {str(args)}")
 
     return wrapper
@@ -1,4 +1,5 @@
-from typing import List
+from itertools import islice
+from typing import Iterable, Iterator, List
 from urllib.parse import quote
 
 
@@ -15,13 +16,20 @@ class ListUtils:
         :param count: The size of each sublist
         :return: A list of sublists of MTBLS accessions.
         """
-        num_sublists = len(master_list) // count
+        return [master_list[i : i + count] for i in range(0, len(master_list), count)]
 
-        result = [master_list[i * count : (i + 1) * count] for i in range(num_sublists)]
-        if len(master_list) % num_sublists != 0:
-            remaining_items = master_list[num_sublists * count :]
-            result.append(remaining_items)
-        return result
+    @staticmethod
+    def iter_lol(master_iterable: Iterable[str], count: int) -> Iterator[List[str]]:
+        """
+        Lazy version of get_lol - yield chunks of a given iterable one at a time, rather than building them all up
+        front.
+        :param master_iterable: An iterable of MTBLS accessions ie ['MTBLS1','MTBLS2'....]
+        :param count: The size of each sublist
+        :return: A generator of sublists of MTBLS accessions.
+        """
+        iterator = iter(master_iterable)
+        while chunk := list(islice(iterator, count)):
+            yield chunk
 
     @staticmethod
     def get_delta(webservice_list: List[str], filesystem_list: List[str]) -> List[str]:
@@ -29,9 +37,11 @@ class ListUtils:
         Return IDs that are found only in the webservice list.
         :param webservice_list: List of MTBLC ids from the webservice.
         :param filesystem_list: List of MTBLC ids from filesystem.
-        :return: List of ids found only in webservice
+        :return: List of ids found only in webservice, deduplicated and in the order the webservice gave them.
         """
-        return list(set(webservice_list) - set(filesystem_list))
+        # only the filesystem side needs to be a set, the webservice side just needs deduplicating
+        on_filesystem = set(filesystem_list)
+        return [compound_id for compound_id in dict.fromkeys(webservice_list) if compound_id not in on_filesystem]
 
     @staticmethod
     def mtblc_list_to_encoded_chebi(ids):
@@ -0,0 +1,68 @@
+import json
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    # orjson decodes the response bytes directly, and several times faster than the json module
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class SessionUtils:
+    """
+    Collection of static requests.Session methods
+    """
+
+    @staticmethod
+    def mount_pooled_adapter(
+        session: requests.Session,
+        pool_connections: int = 20,
+        pool_maxsize: int = 50,
+        retries: int = 3,
+    ) -> requests.Session:
+        """
+        Mount a connection pooling HTTPAdapter with a retry policy onto a given session, so that repeated requests to
+        the same host reuse connections rather than paying for a new TCP/TLS handshake each time. Once the retries on
+        502/503/504 responses run out, the last response is returned as normal rather than raised as a RetryError, so
+        callers keep handling bad statuses and bodies the way they did without the adapter.
+        :param session: Session to mount the adapter on.
+        :param pool_connections: Number of host pools to cache.
+        :param pool_maxsize: Maximum number of connections to keep per host pool.
+        :param retries: Number of retries on connection errors and 502/503/504 responses.
+        :return: The same session, with the adapter mounted.
+        """
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=Retry(
+                total=retries, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False
+            ),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    @staticmethod
+    def pooled_session(**kwargs) -> requests.Session:
+        """
+        Create a new session with a connection pooling adapter mounted.
+        :param kwargs: Passed on to SessionUtils.mount_pooled_adapter.
+        :return: Instantiated Session object.
+        """
+        return SessionUtils.mount_pooled_adapter(requests.Session(), **kwargs)
+
+    @staticmethod
+    def response_json(response: requests.Response) -> Any:
+        """
+        Decode the body of a given response as JSON. Uses orjson on the raw bytes if it is installed, and falls back to
+        the json module if not. Either way, a body that isn't JSON raises a json.JSONDecodeError.
+        :param response: Response whose body to decode.
+        :return: Decoded body, likely as a dict.
+        """
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return json.loads(response.content)
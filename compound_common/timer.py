@@ -1,14 +1,24 @@
-import datetime
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import Union
+from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Timer:
-    start: datetime.datetime
-    end: Union[datetime.datetime, None] = None
+    """
+    Simple stopwatch. Readings are taken with time.perf_counter_ns, which is monotonic and returns a plain int, rather
+    than with datetime.now. The clock starts when the Timer is created.
+    """
+
+    start_ns: int = field(default_factory=time.perf_counter_ns)
+    end_ns: Optional[int] = None
+
+    def stop(self) -> None:
+        self.end_ns = time.perf_counter_ns()
+
+    def delta_s(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e9
 
     def delta(self) -> timedelta:
-        result = self.end - self.start
-        return result
+        return timedelta(microseconds=(self.end_ns - self.start_ns) // 1000)
@@ -1,48 +1,116 @@
-import io
-from typing import List
+import concurrent.futures
+import queue
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
 from retrying import retry
 from compound_common.config_classes import FTPConfig
 
 import ftplib
 import pandas as pd
 
+# assay files are named a_*.txt - starts with 'a_' and ends with '.txt' in a single C level call
+_is_assay_file = re.compile(r"a_.*\.txt", re.DOTALL).fullmatch
+
 
 class EBIFTPHandler:
     def __init__(self, config: FTPConfig):
         self.config = config
         self.ftp = ftplib.FTP(self.config.root)
         self.ftp.login(user=self.config.user, passwd=self.config.password)
+        self._mlsd_supported = True
+        self._assay_files = {}
 
     def get_assay_files(self, study: str) -> List[str]:
         """
-        Get all assay filenames for a given study.
+        Get all assay filenames for a given study. Lists the study directory by absolute path with MLSD, so there is no
+        CWD round trip, and falls back to NLST (for the rest of the session) if the server doesn't support MLSD.
+        Listings are remembered per study, so asking for the same study again doesn't go back to the server.
         :param study: Study accession IE MTBLS123
         :return: List of assay filenames as strings.
         """
-        self.ftp.cwd(f"{self.config.study}{study}/")
-        files = self.ftp.nlst()
-        return [
-            file for file in files if file.startswith("a_") and file.endswith(".txt")
-        ]
+        if study not in self._assay_files:
+            files = self._list_files(f"{self.config.study}{study}/")
+            self._assay_files[study] = [file for file in files if _is_assay_file(file)]
+        return list(self._assay_files[study])
 
-    def load_isa_file(self, isatab_file: str, study: str) -> pd.DataFrame:
+    def invalidate(self, study: Optional[str] = None) -> None:
+        """
+        Forget the remembered assay file listing for a given study, so the next get_assay_files call lists it afresh.
+        :param study: Study accession IE MTBLS123, or None to forget every study.
+        :return: None
         """
+        if study is None:
+            self._assay_files.clear()
+        else:
+            self._assay_files.pop(study, None)
 
-        :param assay_file:
-        :return:
+    def _list_files(self, path: str) -> List[str]:
         """
-        df = None
-        # this shouldn't ever be out of step but just to be safe
-        self.ftp.cwd(f"{self.config.study}{study}/")
+        List the names of the files in a directory on the ftp server.
+        :param path: Absolute path of the directory.
+        :return: List of filenames as strings.
+        """
+        if self._mlsd_supported:
+            try:
+                return [
+                    name for name, facts in self.ftp.mlsd(path, facts=["type"]) if facts.get("type") == "file"
+                ]
+            except ftplib.error_perm:
+                self._mlsd_supported = False
+        return [file.rsplit("/", 1)[-1] for file in self.ftp.nlst(path)]
 
-        buffer = self.download_file(assay_file=isatab_file, buffer=io.BytesIO())
-        # i am a beautiful genius
+    def load_isa_file(
+        self, isatab_file: str, study: str, usecols: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Stream an isatab file from a study straight into a dataframe.
+        :param isatab_file: Filename of the isatab file.
+        :param study: Study accession IE MTBLS123
+        :param usecols: Optional list of columns to parse. Any that are not in the file are skipped, and all others
+            in the file are never parsed.
+        :return: isatab file as a pandas dataframe, or None if it could not be decoded.
+        """
+        df = None
+        # retrieve by absolute path rather than CWD-ing into the study first, which saves a round trip per file
+        path = f"{self.config.study}{study}/{isatab_file}"
+        # a callable, rather than the list itself, so that columns missing from the file are skipped, not an error
+        wanted = (lambda column: column in usecols) if usecols is not None else None
         try:
-            df = pd.read_csv(buffer, sep="\t")
+            df = self.stream_file(path, sep="\t", usecols=wanted)
         except UnicodeDecodeError as e:
             print(f"{study} isatab file {isatab_file} not able to be decoded: {str(e)}")
         return df
 
+    @retry(
+        stop_max_attempt_number=3,
+        wait_fixed=5000,
+        retry_on_exception=lambda e: isinstance(e, ftplib.all_errors),
+    )
+    def stream_file(self, path: str, **read_csv_kwargs) -> pd.DataFrame:
+        """
+        Parse a file on the ftp server with pandas while it is still downloading. pandas reads straight off of the data
+        connection, so parsing overlaps with the transfer and the file is never held in memory as a whole. Uses @retry
+        wrapper to retry the transfer three times on ftp errors.
+        :param path: Absolute path of the file on the ftp server.
+        :param read_csv_kwargs: Passed on to pd.read_csv.
+        :return: file as a pandas dataframe.
+        """
+        self.ftp.voidcmd("TYPE I")
+        try:
+            with self.ftp.transfercmd(f"RETR {path}") as conn, conn.makefile("rb") as stream:
+                df = pd.read_csv(stream, **read_csv_kwargs)
+        except Exception:
+            # the transfer may have been cut short, so clear the servers reply to keep the control connection in step
+            try:
+                self.ftp.voidresp()
+            except ftplib.all_errors:
+                pass
+            raise
+        self.ftp.voidresp()
+        return df
+
     @retry(stop_max_attempt_number=3, wait_fixed=5000)
     def download_file(self, assay_file, buffer):
         """
@@ -54,3 +122,88 @@ class EBIFTPHandler:
         self.ftp.retrbinary(f"RETR {assay_file}", buffer.write)
         buffer.seek(0)
         return buffer
+
+    def close(self) -> None:
+        """
+        Politely end the ftp session, or just drop the connection if the server has already gone away.
+        :return: None
+        """
+        try:
+            self.ftp.quit()
+        except ftplib.all_errors:
+            self.ftp.close()
+
+
+class EBIFTPHandlerPool:
+    """
+    Thread safe pool of EBIFTPHandlers that share a config. An ftplib connection can't be used by two threads at once,
+    so each caller borrows a handler for as long as it needs one, and at most size handlers are ever open. Handlers are
+    only connected when first needed, and one whose call failed with an ftp error is closed rather than handed out
+    again.
+    """
+
+    def __init__(self, config: FTPConfig, size: int, handler: EBIFTPHandler = None):
+        """
+        :param config: FTPConfig to open new handlers with.
+        :param size: Maximum number of handlers (and so ftp connections) open at once.
+        :param handler: Optional handler that is already connected, which becomes the first handler in the pool.
+        """
+        self.config = config
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        if handler is not None:
+            self._idle.put(handler)
+
+    @contextmanager
+    def handler(self) -> Iterator[EBIFTPHandler]:
+        """
+        Borrow a handler from the pool, blocking until one is free if size handlers are already lent out.
+        :return: An EBIFTPHandler, for use in a with statement.
+        """
+        with self._slots:
+            try:
+                handler = self._idle.get_nowait()
+            except queue.Empty:
+                handler = EBIFTPHandler(config=self.config)
+            healthy = True
+            try:
+                yield handler
+            except ftplib.all_errors:
+                healthy = False
+                raise
+            finally:
+                if healthy:
+                    self._idle.put(handler)
+                else:
+                    handler.close()
+
+    def load_isa_files(
+        self, study: str, isatab_files: List[str], usecols: Optional[List[str]] = None
+    ) -> Dict[str, Optional[pd.DataFrame]]:
+        """
+        Stream several isatab files from a study at once, one per pooled connection, so that the time spent waiting on
+        the server overlaps rather than adding up file after file. Never has more than size transfers in flight.
+        :param study: Study accession IE MTBLS123
+        :param isatab_files: Filenames of the isatab files.
+        :param usecols: Optional list of columns to parse, as in EBIFTPHandler.load_isa_file.
+        :return: dict of filename to that isatab file as a pandas dataframe, or None if it could not be decoded.
+        """
+
+        def load(isatab_file: str) -> Optional[pd.DataFrame]:
+            with self.handler() as handler:
+                return handler.load_isa_file(isatab_file=isatab_file, study=study, usecols=usecols)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.size) as executor:
+            return dict(zip(isatab_files, executor.map(load, isatab_files)))
+
+    def close(self) -> None:
+        """
+        Close every handler currently sitting idle in the pool.
+        :return: None
+        """
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
@@ -1,8 +1,9 @@
+from typing import List, Optional
 
 
 class FileSystemHandler:
     def __init__(self):
         pass
 
-    def load_isa_file(self, isatab_file: str, study: str):
+    def load_isa_file(self, isatab_file: str, study: str, usecols: Optional[List[str]] = None):
         pass
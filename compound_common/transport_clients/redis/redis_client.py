@@ -1,11 +1,36 @@
 import json
 import logging
-from typing import Any, Union
+import threading
+from typing import Any, Dict, Iterable, List, Tuple, Union
 
 import redis
 
 from compound_common.config_classes.transport.redis_config import RedisConfig
 
+# connection pools shared by every RedisClient pointed at the same server, so that extra clients reuse connections
+# that are already open and authenticated rather than each opening their own.
+_POOLS: Dict[Tuple, redis.ConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _get_pool(config: RedisConfig) -> redis.ConnectionPool:
+    """
+    Get the shared connection pool for a given config, creating it the first time it is asked for.
+    :param config: RedisConfig describing the server to connect to.
+    :return: redis.ConnectionPool shared with every other client using the same server, db and credentials.
+    """
+    key = (config.host, config.port, config.db, config.password, config.decode_responses)
+    with _POOLS_LOCK:
+        if key not in _POOLS:
+            _POOLS[key] = redis.ConnectionPool(
+                host=config.host,
+                port=config.port,
+                db=config.db,
+                decode_responses=config.decode_responses,
+                password=config.password,
+            )
+        return _POOLS[key]
+
 
 class RedisClient:
     """
@@ -17,28 +42,19 @@ class RedisClient:
     def __init__(self, config: RedisConfig):
         self.config = config
 
-        self.redis = redis.Redis(
-            host=config.host,
-            port=config.port,
-            db=config.db,
-            decode_responses=config.decode_responses,
-            password=config.password,
-        )
+        self.redis = redis.Redis(connection_pool=_get_pool(config))
         if config.debug:
             print(self.check_queue_exists("compounds"))
 
-    def push_to_queue(self, queue_name, payload: Any) -> Union[Any, None]:
+    def push_to_queue(self, queue_name, payload: Any, pre_serialized: bool = False) -> Union[Any, None]:
         """
         Push an item to a given queue. Queue will be created if it doesn't already exist.
         :param queue_name: Name of queue to be pushed to.
         :param payload: Item to be pushed to queue.
+        :param pre_serialized: Whether payload is already a serialized str or bytes, to be pushed as is.
         :return: Response from redis, often an int (1) to indicate success.
         """
-        serialized_message = None
-        try:
-            serialized_message = json.dumps(payload)
-        except Exception as e:
-            logging.exception(f"Couldnt serialize payload: {str(e)}")
+        serialized_message = self._serialize(payload, pre_serialized)
         response = (
             self.redis.lpush(queue_name, serialized_message)
             if serialized_message
@@ -46,6 +62,60 @@ class RedisClient:
         )
         return response
 
+    def push_many(
+        self, queue_name, payloads: Iterable[Any], chunk: int = 500, pre_serialized: bool = False
+    ) -> List[Union[Any, None]]:
+        """
+        Push many items to a given queue. The LPUSHes are sent down a (non transactional) pipeline and flushed every
+        chunk items, so each chunk costs a single round trip to redis rather than one per item.
+        :param queue_name: Name of queue to be pushed to.
+        :param payloads: Items to be pushed to queue, in order.
+        :param chunk: Number of items to send per round trip.
+        :param pre_serialized: Whether payloads are already serialized str or bytes, to be pushed as is.
+        :return: Responses from redis, one per item and in the same order, with None for any that couldnt be serialized.
+        """
+        responses = []
+        pending = []
+        with self.redis.pipeline(transaction=False) as pipe:
+            for payload in payloads:
+                responses.append(None)
+                serialized_message = self._serialize(payload, pre_serialized)
+                if not serialized_message:
+                    continue
+                pipe.lpush(queue_name, serialized_message)
+                pending.append(len(responses) - 1)
+                if len(pending) >= chunk:
+                    self._flush_pipeline(pipe, pending, responses)
+            self._flush_pipeline(pipe, pending, responses)
+        return responses
+
+    @staticmethod
+    def _serialize(payload: Any, pre_serialized: bool) -> Union[str, bytes, None]:
+        """
+        Serialize a payload for pushing to redis, unless the caller has already done so.
+        :param payload: Item to be pushed to queue.
+        :param pre_serialized: Whether payload is already a serialized str or bytes.
+        :return: Serialized payload, or None if it couldnt be serialized.
+        """
+        if pre_serialized:
+            return payload
+        try:
+            return json.dumps(payload)
+        except Exception as e:
+            logging.exception(f"Couldnt serialize payload: {str(e)}")
+            return None
+
+    @staticmethod
+    def _flush_pipeline(pipe, pending: List[int], responses: List[Union[Any, None]]) -> None:
+        """
+        Execute the commands buffered on a pipeline, and file each result at its items index in responses.
+        """
+        if not pending:
+            return
+        for index, response in zip(pending, pipe.execute()):
+            responses[index] = response
+        pending.clear()
+
     def check_queue_exists(self, queue_name) -> dict:
         """
         Check whether a given queue exists or not.
@@ -78,3 +148,23 @@ class RedisClient:
 
         payload = json.loads(seria) if seria is not None else seria
         return payload
+
+    def consume_many(self, queue_name: str, count: int) -> List[Any]:
+        """
+        Consume up to count items from a given queue in a single round trip, using LPOP with a count. Servers older than
+        redis 6.2 don't support the count argument, so for those the LPOPs are sent down a pipeline instead.
+        :param queue_name: Queue to consume items from.
+        :param count: Maximum number of items to consume.
+        :return: Items from the queue in deserialised form, in the order they were popped. Empty if the queue was empty.
+        """
+        try:
+            serialized = self.redis.lpop(queue_name, count)
+        except redis.exceptions.ResponseError:
+            with self.redis.pipeline(transaction=False) as pipe:
+                for _ in range(count):
+                    pipe.lpop(queue_name)
+                serialized = pipe.execute()
+        if not serialized:
+            print(f"Nothing on {queue_name} queue")
+            return []
+        return [json.loads(seria) for seria in serialized if seria is not None]
@@ -1,7 +1,7 @@
 import ast
 import json
 import sys
-from typing import List
+from typing import Iterable, List
 import yaml
 import requests
 
@@ -42,24 +42,25 @@ class CompoundRedisQueueManager:
             print("Queue populated. Risk of duplication. Evacuating Queue.")
             self.redis_client.empty_queue(self.cbrc.name)
         compounds = self.get_compounds_ids(self.cbrc.compound_dir)
-        chunked = ListUtils.get_lol(compounds, self.cbrc.chunk_size)
+        chunked = ListUtils.iter_lol(compounds, self.cbrc.chunk_size)
         self.push_compound_ids_to_redis(chunked)
 
-    def push_compound_ids_to_redis(self, chunked_compound_lists: List[List[str]]):
+    def push_compound_ids_to_redis(self, chunked_compound_lists: Iterable[List[str]]):
         """
-        Take in the 'chunked' lists of MTBLC ids, and push them each in turn to the 'compounds' redis queue.
-        :param chunked_compound_list: A list of lists, where each interior list is a sequence of MTBLC123 ids.
+        Take in the 'chunked' lists of MTBLC ids, and push them all to the 'compounds' redis queue in pipelined batches.
+        :param chunked_compound_list: An iterable of lists, where each interior list is a sequence of MTBLC123 ids.
         :return: None
         """
-        sublist_index, success = 0, 0
-        for lis in chunked_compound_lists:
-            resp = self.redis_client.push_to_queue(self.cbrc.name, json.dumps(lis))
+        responses = self.redis_client.push_many(
+            self.cbrc.name, (json.dumps(lis) for lis in chunked_compound_lists)
+        )
+        success = 0
+        for sublist_index, resp in enumerate(responses):
             if resp is not None:
                 success += 1
                 print(f"Pushed sublist {sublist_index} to {self.cbrc.name} queue")
             else:
                 print(f"Unable to push sublist {sublist_index} to {self.cbrc.name} queue")
-            sublist_index += 1
 
     @http_exception_angel
     def get_compounds_ids(self, mtblc_dir: str = None) -> List[str]:
@@ -68,7 +69,8 @@ class CompoundRedisQueueManager:
         :return: List of compound ids retrieved from the webservice.
         """
         response = self.session.get(self.mtbls_ws_config.metabolights_ws_compounds_list)
-        compounds = response.json()["content"]
+        # interned so that the set lookups in ListUtils.get_delta can match ids on identity
+        compounds = [sys.intern(compound) for compound in response.json()["content"]]
         if self.cbrc.new_compounds_only:
             compounds = ListUtils.get_delta(
                 compounds, DirUtils.get_mtblc_ids_from_directory(mtblc_dir)
@@ -1,21 +1,34 @@
+from collections import Counter
+
+
 class DebugBuilderStats:
     """
     Class to store statistics about a run of the CompoundBuilder. This class is initialised in shared_resources.py in
     global scope. Then using the @compound_debug_harness function wrapper (when enabled), the wrapper increments and
-    updates various counters and statistics.
+    updates various counters and statistics. Counters are held in a single Counter, and can still be read as
+    count_<name> attributes IE stats.count_total_compounds.
     """
 
+    # need to define complete (total_complete_compounds) first - some info is gone forever
+    counters = (
+        "total_compounds",
+        "total_complete_compounds",
+        "compounds_with_ms",
+        "total_ms_files",
+        "compounds_with_nmr",
+        "total_nmr_files",
+        "wiki",
+        "reactomepathways",
+    )
+
     def __init__(self):
-        self.count_total_compounds = 0
-        self.count_total_complete_compounds = (
-            0  # need to define complete first - some info is gone forever
-        )
-        self.count_compounds_with_ms = 0
-        self.count_total_ms_files = 0
-        self.count_compounds_with_nmr = 0
-        self.count_total_nmr_files = 0
-        self.count_wiki = 0
-        self.count_reactomepathways = 0
+        self._counts = Counter(dict.fromkeys(self.counters, 0))
+
+    def __getattr__(self, name: str) -> int:
+        # only called for attributes that aren't found normally, so this is just the count_<name> reads
+        if name.startswith("count_"):
+            return self._counts[name[len("count_"):]]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
 
     def increment(self, which: str, inc: int = 1):
         """
@@ -24,5 +37,4 @@ class DebugBuilderStats:
         :param inc: int amount to increment by.
         :return: None
         """
-        current = getattr(self, f"count_{which}", 0)
-        setattr(self, f"count_{which}", current + inc)
+        self._counts[which] += inc
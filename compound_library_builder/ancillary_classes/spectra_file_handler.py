@@ -1,14 +1,46 @@
-import math
+import concurrent.futures
+from math import floor as _floor
 
 from utils.general_file_utils import GeneralFileUtils
 
+# intensities are scaled by _INTENSITY_FACTOR and then floored to 6 decimal places
+_INTENSITY_FACTOR = 9.99
+_SCALE = 1_000_000.0
+
+# spectra files are written on their own couple of threads, so the http threads that fetch the spectra don't have to
+# wait on the disk. The threads are only started once the first spectrum is handed over.
+_DISK_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="disk")
+
+
+def _parse_spectrum(spectra_id: str, spectra_data: str) -> dict:
+    """
+    Parse a given MoNA spectrum string (whitespace separated mz:intensity datapoints) into a spectrum dict.
+    :param spectra_id: Unique identifier of this spectral data file.
+    :param spectra_data: spectral data to parse.
+    :return: dict with the spectrumId, the peaks, and the lowest and highest mz.
+    """
+    # each datapoint is mz:intensity, and the datapoints are separated by whitespace. Splitting on both at once gives
+    # a flat mz, intensity, mz, intensity... list, without allocating a little list per datapoint.
+    values = spectra_data.replace(":", " ").split()
+    mz_array = [float(mz) for mz in values[0::2]]
+    peaks = [
+        {"intensity": _floor(float(intensity) * _INTENSITY_FACTOR * _SCALE) / _SCALE, "mz": mz}
+        for mz, intensity in zip(mz_array, values[1::2])
+    ]
+    return {
+        "spectrumId": spectra_id,
+        "peaks": peaks,
+        "mzStart": min(mz_array),
+        "mzStop": max(mz_array),
+    }
+
 
 class SpectraFileHandler:
     @staticmethod
     def save_spectra(spectra_id, spectra_data, mtbls_id, destination) -> None:
         """
         Parse a given spectral data file into a dict, and then save it as a .json file using
-        `FileHandler.save_json_file`
+        `GeneralFileUtils.save_json_file`
         :param spectra_id: Unique identifier of this spectral data file.
         :param spectra_data: spectral data file to process.
         :param mtbls_id: the MTBLC accession associated with this spectral data file.
@@ -16,22 +48,17 @@ class SpectraFileHandler:
         :return: None
         """
         final_destination = f"{destination}/{mtbls_id}/{mtbls_id}_spectrum/{spectra_id}/{spectra_id}.json"
-        datapoints = spectra_data.split(" ")
-        ml_spectrum = {"spectrumId": spectra_id, "peaks": []}
-        mz_array = []
-
-        float_round_lambda = lambda num, places, direction: direction(
-            num * (10**places)
-        ) / float(10**places)
-        for datapoint in datapoints:
-            temp_array = datapoint.split(":")
-            temp_peak = {
-                "intensity": float_round_lambda(
-                    float(temp_array[1].strip()) * 9.99, 6, math.floor
-                ),
-                "mz": float(temp_array[0].strip()),
-            }
-            ml_spectrum["peaks"].append(temp_peak)
-            mz_array.append(float(temp_peak["mz"]))
-        ml_spectrum.update({"mzStart": min(mz_array), "mzStop": max(mz_array)})
-        GeneralFileUtils.save_json_file(final_destination, ml_spectrum)
+        GeneralFileUtils.save_json_file(final_destination, _parse_spectrum(spectra_id, spectra_data))
+
+    @staticmethod
+    def save_spectra_in_background(spectra_id, spectra_data, mtbls_id, destination) -> concurrent.futures.Future:
+        """
+        Hand a given spectral data file to the disk threads to be parsed and saved by `save_spectra`, and return
+        straight away without waiting for it to be written.
+        :param spectra_id: Unique identifier of this spectral data file.
+        :param spectra_data: spectral data file to process.
+        :param mtbls_id: the MTBLC accession associated with this spectral data file.
+        :param destination: The MTBLC directory to save the .json file to.
+        :return: Future that completes once the file is saved, and raises whatever save_spectra raised, if anything.
+        """
+        return _DISK_EXECUTOR.submit(SpectraFileHandler.save_spectra, spectra_id, spectra_data, mtbls_id, destination)
@@ -1,6 +1,9 @@
 import concurrent.futures
+import functools
 import json
-from typing import Dict
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, Optional, Tuple
 
 from requests import Session
 
@@ -9,6 +12,7 @@ from compound_common.config_classes.builder_config_files import CompoundBuilderC
 from compound_library_builder.chebi.populator import get_chebi_data
 from compound_library_builder.threaded_api_caller.caller import ThreadedAPICaller
 from compound_library_builder.threaded_api_caller.sorter import ExternalAPIResultSorter
+from compound_common.session_utils import SessionUtils
 from persistence.db.mongo.mongo_client import MongoWrapper
 from utils.command_line_utils import CommandLineUtils
 from utils.general_file_utils import GeneralFileUtils
@@ -16,6 +20,33 @@ from pymongo.errors import DuplicateKeyError, WriteError, PyMongoError
 
 from utils.mongo_utils import MongoUtils
 
+# one executor for the external API calls of every compound, rather than starting and joining a fresh set of threads
+# per compound. Created the first time a compound is built.
+_EXECUTOR = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """
+    Get the process wide executor for external API calls, creating it on first use.
+    :return: ThreadPoolExecutor with a worker per external API task.
+    """
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=6, thread_name_prefix="extapi")
+        return _EXECUTOR
+
+
+@functools.lru_cache(maxsize=1)
+def _get_session() -> Session:
+    """
+    Get the process wide session for http calls, creating it on first use. Its pool is sized for the six external API
+    threads plus the webservice call, so connections to each host are kept alive and reused from compound to compound.
+    :return: Session object with a connection pooling adapter mounted.
+    """
+    return SessionUtils.pooled_session(pool_connections=32, pool_maxsize=32)
+
 
 def build_compound(metabolights_id, ml_mapping, reactome_data, data_directory, save_to_db, chebi_obj):
     """
@@ -31,7 +62,7 @@ def build_compound(metabolights_id, ml_mapping, reactome_data, data_directory, s
     :return: N/A but saves the directory to the data directory.
     """
     config = CompoundBuilderConfig()
-    session = Session()
+    session = _get_session()
     chebi_id = metabolights_id.replace("MTBLC", "").strip()
     mongo_client = None
     if save_to_db:
@@ -40,9 +71,9 @@ def build_compound(metabolights_id, ml_mapping, reactome_data, data_directory, s
     # call our java webservice
     mtblcs = None
     try:
-        mtblcs = session.get(
-            f"{config.urls.mtbls.metabolights_ws_compounds_url}{metabolights_id}"
-        ).json()["content"]
+        mtblcs = SessionUtils.response_json(
+            session.get(f"{config.urls.mtbls.metabolights_ws_compounds_url}{metabolights_id}")
+        )["content"]
     except json.JSONDecodeError as e:
         print(
             f"Error getting info from MTBLS webservice for compound {chebi_id}: {str(e)}"
@@ -67,24 +98,14 @@ def build_compound(metabolights_id, ml_mapping, reactome_data, data_directory, s
     # `ml_compound_chebi_compound_map` so it knows which key on the chebi dict matches which key on the mtbl dict.
     # Also, if a value is not present, and the type of that value is not a string, it refers to the
     # `ml_compound_absent_type_value` map, which specifies what kind of empty value to concatenate
-    compound_dict.update(
-        {
-            key: chebi_dict.get(
-                value,
-                "NA"
-                if key not in config.objs.ml_compound_absent_value_type_map
-                else config.objs.ml_compound_absent_value_type_map[key],
-            )
-            if chebi_dict.get(value) is not None
-            else (
-                print(f"{value} not assigned"),
-                "NA"
-                if key not in config.objs.ml_compound_absent_value_type_map
-                else config.objs.ml_compound_absent_value_type_map[key],
-            )[1]
-            for key, value in config.objs.ml_compound_chebi_compound_map.items()
-        }
-    )
+    absent_value_type_map = config.objs.ml_compound_absent_value_type_map
+    for key, value in config.objs.ml_compound_chebi_compound_map.items():
+        chebi_value = chebi_dict.get(value)
+        if chebi_value is None:
+            if config.rt_flags.verbose_logging:
+                print(f"{value} not assigned")
+            chebi_value = absent_value_type_map.get(key, "NA")
+        compound_dict[key] = chebi_value
 
     # initialise the pathways dicts and the spectra lists
     compound_dict.update(
@@ -98,12 +119,14 @@ def build_compound(metabolights_id, ml_mapping, reactome_data, data_directory, s
         }
     )
 
+    spectra_writes = []
     mementos = configure_thread_pool_and_execute_tasks(
         chebi_compound_dict=chebi_dict,
         config=config,
         session=session,
         mtbls_id=metabolights_id,
         data_directory=data_directory,
+        pending_writes=spectra_writes,
     )
 
     sorter = ExternalAPIResultSorter(mementos)
@@ -120,13 +143,10 @@ def build_compound(metabolights_id, ml_mapping, reactome_data, data_directory, s
     )
 
     # update NMR, species, pathways flags.
-    if (
-        len(compound_dict["pathways"]["ReactomePathways"])
-        + len(compound_dict["pathways"]["KEGGPathways"])
-        + len(compound_dict["pathways"]["WikiPathways"])
-    ) > 0:
+    pathways = compound_dict["pathways"]
+    if pathways["ReactomePathways"] or pathways["KEGGPathways"] or pathways["WikiPathways"]:
         compound_dict["flags"]["hasPathways"] = "true"
-    if len(compound_dict["spectra"]["NMR"]) > 0:
+    if compound_dict["spectra"]["NMR"]:
         compound_dict["flags"]["hasNMR"] = "true"
     if compound_dict["species"]:
         compound_dict["flags"]["hasSpecies"] = "true"
@@ -134,6 +154,10 @@ def build_compound(metabolights_id, ml_mapping, reactome_data, data_directory, s
     if config.rt_flags.verbose_logging:
         mementos_readout(mementos, metabolights_id)
 
+    # make sure every spectra file made it to disk before the compound that refers to them is saved
+    for future in spectra_writes:
+        future.result()
+
     if save_to_db:
         save_compound_to_db(mongo_client, compound_dict)
     else:
@@ -143,15 +167,69 @@ def build_compound(metabolights_id, ml_mapping, reactome_data, data_directory, s
     return compound_dict
 
 
+def build_many(
+    compounds: Iterable[Tuple[str, Optional[dict]]],
+    ml_mapping: dict,
+    reactome_data: dict,
+    data_directory: str,
+    save_to_db: bool = False,
+    processes: Optional[int] = None,
+) -> Dict[str, bool]:
+    """
+    Build many MTBLC compound directories at once, spread across a pool of worker processes. The reference data is
+    handed to each worker once when it starts, rather than with every compound, and each worker keeps its own session
+    and external API executor. A compound that fails to build is reported and skipped, rather than taking the rest of
+    its batch down with it.
+
+    :param compounds: (MTBLC12345 ID, JSON representation of chebi compound) pairs to build.
+    :param ml_mapping: The mapping file, which associates studies to compound ids referenced in that study.
+    :param reactome_data: Reactome data json file.
+    :param data_directory: Directory to save the built compound subdirectories to.
+    :param save_to_db: Whether to save to db instead of fs
+    :param processes: Number of worker processes. Defaults to the number of CPUs.
+    :return: dict of MTBLC ID to whether that compound was built successfully.
+    """
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_init_build_worker,
+        initargs=(ml_mapping, reactome_data, data_directory, save_to_db),
+    ) as executor:
+        return dict(executor.map(_build_in_worker, compounds))
+
+
+# reference data for build_many, set once in each worker process by _init_build_worker
+_WORKER_BUILD_KWARGS = {}
+
+
+def _init_build_worker(ml_mapping: dict, reactome_data: dict, data_directory: str, save_to_db: bool) -> None:
+    _WORKER_BUILD_KWARGS.update(
+        ml_mapping=ml_mapping,
+        reactome_data=reactome_data,
+        data_directory=data_directory,
+        save_to_db=save_to_db,
+    )
+
+
+def _build_in_worker(compound: Tuple[str, Optional[dict]]) -> Tuple[str, bool]:
+    metabolights_id, chebi_obj = compound
+    try:
+        build_compound(metabolights_id=metabolights_id, chebi_obj=chebi_obj, **_WORKER_BUILD_KWARGS)
+    except Exception as e:
+        print(f"Error building compound {metabolights_id}: {str(e)}")
+        return metabolights_id, False
+    return metabolights_id, True
+
+
 def configure_thread_pool_and_execute_tasks(
     chebi_compound_dict: dict,
     config: CompoundBuilderConfig,
     session: Session,
     mtbls_id: str,
     data_directory: str,
+    pending_writes: list = None,
 ):
     """
-    Configure a ThreadPoolExecutor, and instruct each thread to execute a different external API related task.
+    Hand each external API related task to the shared ThreadPoolExecutor, to be executed on its own thread.
     The threads for each task will only start if the corresponding flag is enabled. The RuntimeFlags object starts
     with all flags enabled by default.
     :param chebi_compound_dict: compound dict built from results of chebi API response earlier in compound building.
@@ -159,7 +237,9 @@ def configure_thread_pool_and_execute_tasks(
     :param session: Session object, shared among threads, to make http calls.
     :param mtbls_id: the MTBLC12335 ID of the current compound.
     :param data_directory: Where the compound directory and spectra files will be saved.
-    :return: list of result dicts.
+    :param pending_writes: Optional list to collect futures for the spectra files being saved in the background. If
+        not given, the spectra files are saved on the thread that fetches them.
+    :return: dict of api name to the results from that api, for each api that was enabled.
     """
     # collect the inputs for each method wrapper wrapper into a tuple. We do this as threadpool executors can only take
     # one argument.
@@ -181,6 +261,7 @@ def configure_thread_pool_and_execute_tasks(
         chebi_compound_dict["inchiKey"],
         config,
         session,
+        pending_writes,
     )
     wiki_pathways_input = (chebi_compound_dict["inchiKey"], mtbls_id, config, session)
     kegg_pathways_input = (chebi_compound_dict, config, session)
@@ -202,37 +283,21 @@ def configure_thread_pool_and_execute_tasks(
         ThreadedAPICaller.kegg_wrapper,
     ]
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=6) as ur_executor:
-        # create a list of empty result dicts to make processing easier later
-        the_duds = [
-            {
-                "name": config.rt_flags.mapping[
-                    _InternalUtils.extract_name_from_function(method)
-                ],
-                "results": None,
-            }
-            for method in method_list
-            if _InternalUtils.flag_is_enabled(config.rt_flags, method) is False
-        ]
-
-        # create a list of futures object, where each future is a thread corresponding to an enabled runtime flag.
-        the_futures = [
-            ur_executor.submit(method, args)
-            for method, args in zip(method_list, input_list)
-            if _InternalUtils.flag_is_enabled(config.rt_flags, method)
-        ]
-
-        # wait for and collect the results of each individual thread
-        the_results = [
-            future.result()
-            for future in concurrent.futures.as_completed(
-                the_futures, config.rt_flags.timeout
-            )
-        ]
+    ur_executor = _get_executor()
+    # each enabled runtime flag gets a future, which is a thread running its method. Disabled ones are left out
+    # altogether, and the ExternalAPIResultSorter treats an api missing from the results as having no results.
+    the_futures = [
+        ur_executor.submit(method, args)
+        for method, args in zip(method_list, input_list)
+        if getattr(config.rt_flags, _InternalUtils.flag_name(config.rt_flags, method))
+    ]
 
-        # add the duds to the results
-        the_results.extend(the_duds)
-        return the_results
+    # wait for and collect the results of each individual thread, keyed by the name of its api
+    the_results = {}
+    for future in concurrent.futures.as_completed(the_futures, config.rt_flags.timeout):
+        memento = future.result()
+        the_results[memento["name"]] = memento["results"]
+    return the_results
 
 
 def get_reactome_data(mtblc_compound_id: str, reactome_data: dict) -> dict:
@@ -243,26 +308,20 @@ def get_reactome_data(mtblc_compound_id: str, reactome_data: dict) -> dict:
     :param reactome_data: Reactome data as a dict.
     :return: Reactome pathways for this compound, as a dict.
     """
-    temp_reactome_pathways = (
-        reactome_data[mtblc_compound_id] if mtblc_compound_id in reactome_data else []
-    )
-    reactome_pathways = {}
-    try:
-        for pathway in temp_reactome_pathways:
-            temp_pathway = {
-                "name": pathway["pathway"],
-                "pathwayId": pathway["pathwayId"],
-                "url": pathway["reactomeUrl"],
-                "reactomeId": pathway["reactomeId"],
-            }
-            if pathway["species"] not in reactome_pathways:
-                reactome_pathways[pathway["species"]] = [temp_pathway]
-            else:
-                reactome_pathways[pathway["species"]].append(temp_pathway)
-    except KeyError as e:
-        print(f"Error populating dict for {mtblc_compound_id}: {str(e)}")
-    finally:
-        return reactome_pathways
+    reactome_pathways = defaultdict(list)
+    for pathway in reactome_data.get(mtblc_compound_id) or ():
+        try:
+            reactome_pathways[pathway["species"]].append(
+                {
+                    "name": pathway["pathway"],
+                    "pathwayId": pathway["pathwayId"],
+                    "url": pathway["reactomeUrl"],
+                    "reactomeId": pathway["reactomeId"],
+                }
+            )
+        except KeyError as e:
+            print(f"Error populating dict for {mtblc_compound_id}: {str(e)}")
+    return dict(reactome_pathways)
 
 
 def get_nmr(spectra) -> list:
@@ -298,11 +357,10 @@ def get_nmr(spectra) -> list:
     return nmr
 
 def mementos_readout(mementos, metabolights_id):
-    print(
-        f"___________________________multithreaded api results for {metabolights_id}_____________"
-    )
-    for d in mementos:
-        print(d.values())
+    # built up front and printed in one go, so the readout is a single write rather than one per api
+    lines = [f"___________________________multithreaded api results for {metabolights_id}_____________"]
+    lines.extend(f"{name} {results}" for name, results in mementos.items())
+    print("\n".join(lines))
 
 def save_compound_to_db(mongo_client: MongoWrapper, compound_dict: Dict):
     """
@@ -365,27 +423,14 @@ class _InternalUtils:
         print("Requesting compound chemical information from ChEBI:")
 
     @staticmethod
-    def pascal_case(string: str) -> str:
-        """
-        Return a string with the first character lower case-d.
-
-        :param string: String to pascal case-ify.
-        :return: Pascal case-ified string.
-        """
-        return string[0].lower() + string[1:]
-
-    @staticmethod
-    def flag_is_enabled(rt_config: RuntimeFlags, method) -> bool:
+    def flag_name(rt_config: RuntimeFlags, method) -> str:
         """
-        Check whether a given config flag is enabled.
+        Get the name of the runtime flag that governs a given function wrapper.
         :param rt_config: RuntimeFlags config object.
         :param method: Function wrapper that we extract the runtime flag from.
-        :return: boolean indicating whether flag is enabled or not.
+        :return: name of the flag on the RuntimeFlags object, IE 'spectra'.
         """
-        key = _InternalUtils.extract_name_from_function(method)
-        string = rt_config.mapping[key]
-        boolean = rt_config.__getattribute__(string)
-        return boolean
+        return rt_config.mapping[_InternalUtils.extract_name_from_function(method)]
 
     @staticmethod
     def extract_name_from_function(method) -> str:
@@ -3,10 +3,18 @@ from typing import Optional
 import requests as requests
 
 from compound_common.config_classes.builder_config_files import CompoundBuilderConfig
-from compound_common.function_wrappers.builder_wrappers.dict_exception_angel import dict_exception_angel
+from compound_common.dict_utils import DictUtils
 from utils.command_line_utils import CommandLineUtils
 
 
+# keys a compound origin might keep each of the chebi_species_keys under, in order of preference
+_ORIGIN_KEYS = {
+    "SpeciesAccession": ("species_accession", "SpeciesAccession", "speciesAccession"),
+    "SourceType": ("SourceType", "source_type"),
+    "SourceAccession": ("SourceAccession", "source_accession"),
+}
+
+
 def get_chebi_data(id, ml_mapping, config, chebi_obj) -> dict:
     """
     Hit the ChEBI API and parse the *JSON* response. It then populates a 'basic'
@@ -28,35 +36,35 @@ def get_chebi_data(id, ml_mapping, config, chebi_obj) -> dict:
     # ----- BASIC DICT -----
     # Map existing chebi_basic_keys onto the new JSON structure.
     # We avoid touching _InternalUtils.get_val here to keep this logic local.
-    chemical_data = data.get("chemical_data", {}) or {}
-    structure = data.get("default_structure", {}) or {}
-
     chebi_basic_dict = {
         "definition": data.get("definition"),
-        "smiles": structure.get("smiles"),
-        "inchi": structure.get("standard_inchi"),
-        "inchiKey": structure.get("standard_inchi_key"),
-        "charge": chemical_data.get("charge"),
-        "mass": chemical_data.get("mass"),
-        "monoisotopicMass": chemical_data.get("monoisotopic_mass"),
+        "smiles": DictUtils.dig(data, "default_structure", "smiles"),
+        "inchi": DictUtils.dig(data, "default_structure", "standard_inchi"),
+        "inchiKey": DictUtils.dig(data, "default_structure", "standard_inchi_key"),
+        "charge": DictUtils.dig(data, "chemical_data", "charge"),
+        "mass": DictUtils.dig(data, "chemical_data", "mass"),
+        "monoisotopicMass": DictUtils.dig(data, "chemical_data", "monoisotopic_mass"),
         "chebiAsciiName": data.get("ascii_name") or data.get("name"),
     }
     chebi_basic_dict["id"] = id
 
     # ----- ADVANCED DICT -----
     chebi_advanced_populator = ChebiPopulator(data, config)
-    # fmt: off
-    chebi_advanced_populator \
-        .get_synonyms() \
-        .get_iupac_names() \
-        .get_formulae() \
-        .get_citations() \
-        .get_database_links() \
-        .get_species_via_compound_origins() \
-        .get_species_via_compound_mapping(
-            ml_mapping, chebi_basic_dict["id"]
-        )
-    # fmt: on
+    # with no ChEBI data (IE the entry was missing from the response) there is nothing for these to find, so leave the
+    # populator's empty defaults in place. The mapping file is ours, so it is still worth checking.
+    if data:
+        # fmt: off
+        chebi_advanced_populator \
+            .get_synonyms() \
+            .get_iupac_names() \
+            .get_formulae() \
+            .get_citations() \
+            .get_database_links() \
+            .get_species_via_compound_origins()
+        # fmt: on
+    chebi_advanced_populator.get_species_via_compound_mapping(
+        ml_mapping, chebi_basic_dict["id"]
+    )
 
     chebi_advanced_dict = {
         key: getattr(chebi_advanced_populator, value)
@@ -83,45 +91,31 @@ class ChebiPopulator:
         self.compound_origins: list[dict] = []
         self.species: dict[str, list[dict]] = {}
 
-    @dict_exception_angel
     def get_synonyms(self):
         """
         Populate `self.synonyms` using the new JSON:
         data["names"]["SYNONYM"] is a list of dicts with at least
         'name' / 'ascii_name'.
         """
-        names = self.data.get("names", {}) or {}
-        for syn in names.get("SYNONYM", []):
-            # Prefer ascii_name if present; fallback to name.
-            name = syn.get("ascii_name") or syn.get("name")
-            if name:
-                self.synonyms.append(name)
+        self.synonyms.extend(self._names_of_type("SYNONYM"))
         return self
 
-    @dict_exception_angel
     def get_iupac_names(self):
         """
         Populate `self.iupac_names` using data["names"]["IUPAC NAME"].
         """
-        names = self.data.get("names", {}) or {}
-        for iupac in names.get("IUPAC NAME", []):
-            name = iupac.get("ascii_name") or iupac.get("name")
-            if name:
-                self.iupac_names.append(name)
+        self.iupac_names.extend(self._names_of_type("IUPAC NAME"))
         return self
 
-    @dict_exception_angel
     def get_formulae(self):
         """
         Populate `self.formulae` from data["chemical_data"]["formula"].
         """
-        chemical_data = self.data.get("chemical_data", {}) or {}
-        formula = chemical_data.get("formula")
+        formula = DictUtils.dig(self.data, "chemical_data", "formula")
         if formula:
             self.formulae = formula
         return self
 
-    @dict_exception_angel
     def get_citations(self):
         """
         Populate `self.citations` from data["database_accessions"]["CITATION"].
@@ -133,10 +127,11 @@ class ChebiPopulator:
             'type'   -> 'CITATION' or the provided type
             'data'   -> accession number / url
         """
-        db_accs = self.data.get("database_accessions", {}) or {}
-        citations = db_accs.get("CITATION", []) or []
+        citations = DictUtils.dig(self.data, "database_accessions", "CITATION", default=[])
 
         for acc in citations:
+            if not isinstance(acc, dict):
+                continue
             # Map into the old shape
             source_val = acc.get("source_name") or acc.get("prefix")
             type_val = acc.get("type") or "CITATION"
@@ -151,7 +146,6 @@ class ChebiPopulator:
 
         return self
 
-    @dict_exception_angel
     def get_database_links(self):
         """
         Populate `self.database_links` from non-CITATION entries in
@@ -161,13 +155,17 @@ class ChebiPopulator:
         (and optionally 'type') so downstream code still sees a similar
         structure to the XML-based version.
         """
-        db_accs = self.data.get("database_accessions", {}) or {}
+        db_accs = DictUtils.dig(self.data, "database_accessions", default={})
+        if not isinstance(db_accs, dict):
+            return self
 
         for acc_type, entries in db_accs.items():
-            if acc_type == "CITATION":
+            if acc_type == "CITATION" or not isinstance(entries, list):
                 continue
 
-            for acc in entries or []:
+            for acc in entries:
+                if not isinstance(acc, dict):
+                    continue
                 source_val = acc.get("source_name") or acc.get("prefix") or acc_type
                 value_val = acc.get("accession_number") or acc.get("url")
                 db_link = {
@@ -179,7 +177,6 @@ class ChebiPopulator:
 
         return self
 
-    @dict_exception_angel
     def get_species_via_compound_origins(self):
         """
         Populate self.species based on data["compound_origins"].
@@ -193,11 +190,15 @@ class ChebiPopulator:
 
         The resulting dicts are grouped under self.species[species_name].
         """
-        origins = self.data.get("compound_origins", []) or []
-        if not origins:
+        origins = self.data.get("compound_origins") or []
+        if not isinstance(origins, list):
             return self
 
+        # work out the candidate origin keys for each species key once, rather than per key per origin
+        lookups = [(key, _ORIGIN_KEYS.get(key, ())) for key in self.config.objs.chebi_species_keys]
         for origin in origins:
+            if not isinstance(origin, dict):
+                continue
             # Try to discover species text under a few plausible keys
             raw_species = (
                 origin.get("species_text")
@@ -213,22 +214,12 @@ class ChebiPopulator:
 
             # Build the origin dict according to chebi_species_keys
             origin_dict = {}
-            for key in self.config.objs.chebi_species_keys:
-                if key == "SpeciesAccession":
-                    val = (
-                        origin.get("species_accession")
-                        or origin.get("SpeciesAccession")
-                        or origin.get("speciesAccession")
-                    )
-                elif key == "SourceType":
-                    val = origin.get("SourceType") or origin.get("source_type")
-                elif key == "SourceAccession":
-                    val = (
-                        origin.get("SourceAccession")
-                        or origin.get("source_accession")
-                    )
-                else:
-                    val = None
+            for key, origin_keys in lookups:
+                val = None
+                for origin_key in origin_keys:
+                    val = origin.get(origin_key)
+                    if val:
+                        break
 
                 origin_dict[key] = val if val is not None else "N/A"
 
@@ -236,30 +227,39 @@ class ChebiPopulator:
 
         return self
 
-    @dict_exception_angel
     def get_species_via_compound_mapping(self, mapping: dict, id: str):
         """
         Uses the big study-compound-species mapping file to add species entries.
         This logic is JSON-agnostic and stays essentially the same.
         """
-        compound_key = f"CHEBI:{id}"
-        if compound_key in mapping.get("compound_mapping", {}):
-            study_species_list = mapping["compound_mapping"][compound_key]
-            for study_s in study_species_list:
-                temp_study_species = str(study_s["species"]).lower()
-                if temp_study_species not in self.species:
-                    self.species[temp_study_species] = []
-
-                origin_dict = {
-                    key: (
-                        study_s[
-                            self.config.objs.chebi_species_via_mapping_file_map[key]
-                        ]
-                        if key != "Species"
-                        else temp_study_species
-                    )
-                    for key in self.config.objs.chebi_species_via_mapping_file_map.keys()
-                }
-                self.species[temp_study_species].append(origin_dict)
+        study_species_list = DictUtils.dig(mapping, "compound_mapping", f"CHEBI:{id}", default=[])
+        # Species is filled from the study species itself rather than looked up, so it is left out of the lookups
+        study_keys = [
+            (key, value)
+            for key, value in self.config.objs.chebi_species_via_mapping_file_map.items()
+            if key != "Species"
+        ]
+        for study_s in study_species_list:
+            temp_study_species = str(study_s.get("species")).lower()
+            if temp_study_species not in self.species:
+                self.species[temp_study_species] = []
+
+            origin_dict = {key: study_s.get(value) for key, value in study_keys}
+            origin_dict["Species"] = temp_study_species
+            self.species[temp_study_species].append(origin_dict)
 
         return self
+
+    def _names_of_type(self, name_type: str) -> list[str]:
+        """
+        Get every name of a given type from data["names"], IE "SYNONYM" or "IUPAC NAME". Each entry is a dict with at
+        least 'name' / 'ascii_name', and ascii_name is preferred if present.
+        """
+        names = []
+        for entry in DictUtils.dig(self.data, "names", name_type, default=[]):
+            if not isinstance(entry, dict):
+                continue
+            name = entry.get("ascii_name") or entry.get("name")
+            if name:
+                names.append(name)
+        return names
@@ -1,11 +1,21 @@
 import json
+import logging
+from typing import Dict, List
 
 import requests as requests
 
 from compound_common.config_classes.builder_config_files import CompoundBuilderConfig, CompoundBuilderObjs
+from compound_common.list_utils import ListUtils
+from compound_common.session_utils import SessionUtils
 from compound_common.function_wrappers.builder_wrappers.http_exception_angel import http_exception_angel
 from compound_library_builder.ancillary_classes.spectra_file_handler import SpectraFileHandler
 
+# most entries kegg's get operation will return from a single request
+_KEGG_GET_LIMIT = 10
+
+# parsed kegg pathways by pathway id, kept for the whole run as the same pathways turn up for many compounds
+_KEGG_PATHWAYS: Dict[str, dict] = {}
+
 
 class ThreadedAPICaller:
     """
@@ -40,15 +50,16 @@ class ThreadedAPICaller:
         """
         print("Attempting to get data from europePMC API.")
         epmc_list = []
+        citation_keys = tuple(config.objs.epmc_citation_keys_map.items())
         for citation in citations:
             val = f'{config.urls.misc_urls.epmc_api}{str(citation["value"])}'
-            print(
-                f"attempting to hit {val}&format=json&resultType=core&cursorMark=*&pageSize=25"
-            )
+            logging.debug("attempting to hit %s&format=json&resultType=core&cursorMark=*&pageSize=25", val)
             try:
-                citation_epmc_data = session.get(
-                    f'{config.urls.misc_urls.epmc_api}{str(citation["value"])}&format=json&resultType=core'
-                ).json()["resultList"]["result"][0]
+                citation_epmc_data = SessionUtils.response_json(
+                    session.get(
+                        f'{config.urls.misc_urls.epmc_api}{str(citation["value"])}&format=json&resultType=core'
+                    )
+                )["resultList"]["result"][0]
             except json.decoder.JSONDecodeError as e:
                 print(
                     f'No response for individual citation {str(citation["value"])}:{str(e)}'
@@ -59,14 +70,7 @@ class ThreadedAPICaller:
                     f'No response for individual citation {str(citation["value"])}:{str(e)}'
                 )
                 continue
-            citation.update(
-                {
-                    key: citation_epmc_data[value]
-                    if value in citation_epmc_data
-                    else "NA"
-                    for key, value in config.objs.epmc_citation_keys_map.items()
-                }
-            )
+            citation.update({key: citation_epmc_data.get(value, "NA") for key, value in citation_keys})
             epmc_list.append(citation)
         return epmc_list
 
@@ -123,17 +127,13 @@ class ThreadedAPICaller:
         columns = "&columns=rhea-id,equation,chebi-id"
         format = "&format=json"
         limit = "&limit=10"
-        rhea_data = session.get(
-            f'{rhea_api}{query}{chebi_compound_dict["id"]}{columns}{format}{limit}'
-        ).json()
-        print(
-            f'rhea data for chebi id {chebi_compound_dict["id"]} : {rhea_data["results"]}'
+        rhea_data = SessionUtils.response_json(
+            session.get(f'{rhea_api}{query}{chebi_compound_dict["id"]}{columns}{format}{limit}')
         )
+        logging.debug("rhea data for chebi id %s : %s", chebi_compound_dict["id"], rhea_data["results"])
+        reaction_keys = tuple(conf_objs.reactions_keys.items())
         reactions = [
-            {
-                key: result[value] if value in result else ""
-                for key, value in conf_objs.reactions_keys.items()
-            }
+            {key: result.get(value, "") for key, value in reaction_keys}
             for result in rhea_data["results"]
         ]
         return reactions
@@ -153,16 +153,19 @@ class ThreadedAPICaller:
         inchi_key: str,
         config: CompoundBuilderConfig,
         session: requests.Session,
+        pending_writes: list = None,
     ) -> list:
         """
         Ping the MoNA API with the inchikey for a given compound as a query parameter. Then, for each result, parse that
-        result into a spectra dict, and pass that dict to `_FileHandler.save_spectra` to further process the spectral
-        data and save it as a .json file.
+        result into a spectra dict, and pass that dict to `SpectraFileHandler.save_spectra` to further process the
+        spectral data and save it as a .json file.
         :param mtbls_id: The MTBLC accession number associated with the MTBLC compound we are building.
         :param dest: The parent compound reference directory.
         :param inchi_key: inchi_key associated with a given compound.
         :param config: CompoundBuilderConfig object, mona_api endpoint extracted from within.
         :param session: Session object to make http call.
+        :param pending_writes: Optional list. If given, the spectra files are saved in the background rather than on
+            this thread, and a future for each one is added to the list for the caller to wait on.
         :return: list of spectra objects representing a spectrum.
         """
         print(
@@ -174,7 +177,7 @@ class ThreadedAPICaller:
         )
         if response.status_code not in [200, 201, 202, 203]:
             return ml_spectrum
-        result = response.json()
+        result = SessionUtils.response_json(response)
         for spectra in result:
             ml_spectra = {
                 "splash": spectra["splash"],
@@ -197,9 +200,16 @@ class ThreadedAPICaller:
                     }
                     ml_spectra["attributes"].append(temp_attribute)
             ml_spectrum.append(ml_spectra)
-            SpectraFileHandler.save_spectra(
-                str(spectra["id"]), spectra["spectrum"], mtbls_id, dest
-            )
+            if pending_writes is None:
+                SpectraFileHandler.save_spectra(
+                    str(spectra["id"]), spectra["spectrum"], mtbls_id, dest
+                )
+            else:
+                pending_writes.append(
+                    SpectraFileHandler.save_spectra_in_background(
+                        str(spectra["id"]), spectra["spectrum"], mtbls_id, dest
+                    )
+                )
         return ml_spectrum
 
     @staticmethod
@@ -232,7 +242,7 @@ class ThreadedAPICaller:
         wikipathways_response = session.get(
             val
         )
-        wikipathways = wikipathways_response.json()['result']
+        wikipathways = SessionUtils.response_json(wikipathways_response)['result']
 
         for pathway in wikipathways:
             if pathway["species"] not in final_pathways:
@@ -285,37 +295,85 @@ class ThreadedAPICaller:
         if kegg_id is None:
             return final_kegg_pathways
 
-        print(
-            f"Attempting step 2 of getting kegg data with url {config.urls.kegg.kegg_pathways_list_api}{kegg_id}"
+        logging.debug(
+            "Attempting step 2 of getting kegg data with url %s%s", config.urls.kegg.kegg_pathways_list_api, kegg_id
         )
         pathways_data = session.get(
             f"{config.urls.kegg.kegg_pathways_list_api}{kegg_id}"
         ).text
+        pathway_ids = []
         for line in pathways_data.strip().split("\n"):
             if line == "":
                 continue
             try:
-                pathway_id = line.split("\t")[1].strip()
+                pathway_ids.append(line.split("\t")[1].strip())
             except IndexError as e:
                 print(
                     f"Couldnt get pathway id due to index error when parsing pathways response: {str(e)}"
                 )
-                continue
-            pathway_data = session.get(
-                f"{config.urls.kegg.kegg_pathway_api}{pathway_id}"
-            ).text
-            pathway_dict = {"id": pathway_id}
-            for pline in pathway_data.strip().split("\n"):
-                if "NAME" in pline:
-                    pathway_dict["name"] = pline.replace("NAME", "").strip()
-                elif "KO_PATHWAY" in pline:
-                    pathway_dict["KO_PATHWAYS"] = pline.replace(
-                        "KO_PATHWAYS", ""
-                    ).strip()
-                elif "DESCRIPTION" in pline:
-                    pathway_dict["description"] = pline.replace(
-                        "DESCRIPTION", ""
-                    ).strip()
-            final_kegg_pathways.append(pathway_dict)
+
+        # pathways are shared between many compounds, so only fetch the ones no earlier compound has already fetched.
+        # kegg's get operation takes several entries joined with +, so those are fetched in batches rather than one
+        # request per pathway
+        fetched = {}
+        missing = [pathway_id for pathway_id in pathway_ids if pathway_id not in _KEGG_PATHWAYS]
+        for batch in ListUtils.iter_lol(missing, _KEGG_GET_LIMIT):
+            pathways = ThreadedAPICaller.split_kegg_entries(
+                session.get(f"{config.urls.kegg.kegg_pathway_api}{'+'.join(batch)}").text
+            )
+            for pathway_id in batch:
+                # pathways come back under their bare entry id IE map00010, not path:map00010
+                lines = pathways.get(pathway_id.split(":")[-1])
+                fetched[pathway_id] = ThreadedAPICaller.parse_kegg_pathway(pathway_id, lines or [])
+                # anything kegg didn't return this time is left out of the cache, to be asked for again
+                if lines is not None:
+                    _KEGG_PATHWAYS[pathway_id] = fetched[pathway_id]
+
+        for pathway_id in pathway_ids:
+            pathway_dict = fetched.get(pathway_id) or _KEGG_PATHWAYS[pathway_id]
+            # copied, as the cached dict is shared with every other compound on this pathway
+            final_kegg_pathways.append(dict(pathway_dict))
         return final_kegg_pathways
 
+    @staticmethod
+    def parse_kegg_pathway(pathway_id: str, lines: List[str]) -> dict:
+        """
+        Parse the lines of a kegg pathway entry into a pathway dict.
+        :param pathway_id: kegg pathway id IE path:map00010.
+        :param lines: Lines of the kegg flat file entry for that pathway.
+        :return: pathway dict with the id, and the name, KO_PATHWAYS and description where the entry has them.
+        """
+        pathway_dict = {"id": pathway_id}
+        for pline in lines:
+            if "NAME" in pline:
+                pathway_dict["name"] = pline.replace("NAME", "").strip()
+            elif "KO_PATHWAY" in pline:
+                pathway_dict["KO_PATHWAYS"] = pline.replace(
+                    "KO_PATHWAYS", ""
+                ).strip()
+            elif "DESCRIPTION" in pline:
+                pathway_dict["description"] = pline.replace(
+                    "DESCRIPTION", ""
+                ).strip()
+        return pathway_dict
+
+    @staticmethod
+    def split_kegg_entries(kegg_data: str) -> Dict[str, List[str]]:
+        """
+        Split a kegg flat file response holding one or more entries into the lines of each entry. Entries are ended by
+        a /// line, and each starts with an ENTRY line giving its id. Entries that kegg couldn't find are simply missing
+        from the response.
+        :param kegg_data: Text of the kegg get response.
+        :return: dict of entry id, IE map00010, to the lines of that entry.
+        """
+        entries = {}
+        lines = []
+        for line in kegg_data.split("\n"):
+            if line.startswith("///"):
+                if lines and lines[0].startswith("ENTRY") and len(lines[0].split()) > 1:
+                    entries[lines[0].split()[1]] = lines
+                lines = []
+            elif line.strip():
+                lines.append(line)
+        return entries
+
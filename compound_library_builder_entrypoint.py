@@ -1,13 +1,13 @@
 """
 Warning! this script will fail unless it has its requirements.txt requirements installed!
 """
-import datetime
 import sys
 
 import requests
 
 from compound_common.argparse_classes.parsers import ArgParsers
 from compound_common.config_classes.transport.redis_config import RedisConfig, CompoundBuilderRedisConfig
+from compound_common.disk_cache import DiskCache
 from compound_common.list_utils import ListUtils
 from compound_common.timer import Timer
 from compound_common.transport_clients.redis.redis_client import RedisClient
@@ -28,7 +28,7 @@ def main(args):
     # Extract command line arguments and ready up configs
     parser = ArgParsers.compound_builder_parser()
     args = parser.parse_args(args)
-    overall_process_timer = Timer(datetime.datetime.now())
+    overall_process_timer = Timer()
 
     redis_config = RedisConfig(**GeneralFileUtils.open_yaml_file(args.redis_config))
     compound_queue_manager_config = CompoundBuilderRedisConfig(
@@ -45,6 +45,7 @@ def main(args):
         redis_client=RedisClient(config=redis_config),
     )
     chebi_bulk_session = requests.Session()
+    chebi_cache = DiskCache(args.chebi_cache) if args.chebi_cache else None
 
     # Load reference files
     ml_mapping = mpm.msgpack.load("mapping")
@@ -57,23 +58,48 @@ def main(args):
             if not compound_list:
                 break
             print(f"Number of compounds received from list: {len(compound_list)}")
-            process_compounds(compound_list, ml_mapping, reactome_data, args.destination, chebi_bulk_session, args.database)
+            process_compounds(
+                compound_list, ml_mapping, reactome_data, args.destination, chebi_bulk_session, args.database,
+                args.processes, chebi_cache
+            )
 
     # do the whole list of MTBLC IDs in one batch (legacy)
     else:
         compound_list = crqm.get_compounds_ids()
         print(f"Number of compounds received from list: {len(compound_list)}")
-        process_compounds(compound_list, ml_mapping, reactome_data, args.destination, chebi_bulk_session)
+        process_compounds(
+            compound_list, ml_mapping, reactome_data, args.destination, chebi_bulk_session,
+            processes=args.processes, chebi_cache=chebi_cache
+        )
 
-    overall_process_timer.end = datetime.datetime.now()
+    overall_process_timer.stop()
     print(f"Time taken for compound building process: {overall_process_timer.delta()}")
 
 
-def process_compounds(compound_list, ml_mapping, reactome_data, data_directory,session: requests.Session, save_to_db=False):
-    chebi_compound_objects = session.get(f"https://www.ebi.ac.uk/chebi/backend/api/public/compounds/?chebi_ids={ListUtils.mtblc_list_to_encoded_chebi(compound_list)}").json()
-    clean = {k.strip(): v for k, v in chebi_compound_objects.items()}
+def process_compounds(
+    compound_list, ml_mapping, reactome_data, data_directory, session: requests.Session, save_to_db=False, processes=1,
+    chebi_cache: DiskCache = None
+):
+    clean = get_chebi_objects(compound_list, session, chebi_cache)
+    if processes > 1:
+        chunk_timer = Timer()
+        compounds = [
+            (compound.strip(), clean.get(f"CHEBI:{compound.replace('MTBLC', '').strip()}"))
+            for compound in compound_list
+        ]
+        results = build_compound_library.build_many(
+            compounds,
+            ml_mapping=ml_mapping,
+            reactome_data=reactome_data,
+            data_directory=data_directory,
+            save_to_db=save_to_db,
+            processes=processes,
+        )
+        chunk_timer.stop()
+        print(f"Built {sum(results.values())}/{len(results)} compounds in {chunk_timer.delta()}")
+        return
     for compound in compound_list:
-        current_compound_timer = Timer(datetime.datetime.now())
+        current_compound_timer = Timer()
         obj_key = f"CHEBI:{compound.replace('MTBLC', '').strip().lstrip()}"
         __ = execute(
             metabolights_id=compound.strip(),
@@ -83,10 +109,40 @@ def process_compounds(compound_list, ml_mapping, reactome_data, data_directory,s
             save_to_db=save_to_db,
             chebi_obj=clean.get(obj_key)
         )
-        current_compound_timer.end = datetime.datetime.now()
+        current_compound_timer.stop()
         print(f"{compound} processing time: {current_compound_timer.delta()}")
 
 
+def get_chebi_objects(compound_list, session: requests.Session, chebi_cache: DiskCache = None) -> dict:
+    """
+    Get the ChEBI API entries for a list of MTBLC ids, keyed by CHEBI:12345 id. Any entries in the cache are used as
+    they are, and everything else is fetched from ChEBI in a single bulk request, and then cached.
+    :param compound_list: List of MTBLC ids.
+    :param session: Session object to make the http call.
+    :param chebi_cache: Optional DiskCache of ChEBI entries from earlier runs.
+    :return: dict of CHEBI id to ChEBI entry.
+    """
+    clean = {}
+    missing = compound_list
+    if chebi_cache is not None:
+        for compound in compound_list:
+            key = f"CHEBI:{compound.replace('MTBLC', '').strip()}"
+            cached = chebi_cache.get(key)
+            if cached is not None:
+                clean[key] = cached
+        missing = [
+            compound for compound in compound_list if f"CHEBI:{compound.replace('MTBLC', '').strip()}" not in clean
+        ]
+    if missing:
+        chebi_compound_objects = session.get(f"https://www.ebi.ac.uk/chebi/backend/api/public/compounds/?chebi_ids={ListUtils.mtblc_list_to_encoded_chebi(missing)}").json()
+        fetched = {k.strip(): v for k, v in chebi_compound_objects.items()}
+        if chebi_cache is not None:
+            for key, chebi_obj in fetched.items():
+                chebi_cache.set(key, chebi_obj)
+        clean.update(fetched)
+    return clean
+
+
 # TODO: make enabled configurable
 @compound_debug_harness(enabled=DEBUG_ENABLED)
 def execute(
@@ -1,13 +1,11 @@
-import argparse
 import sys
 
 from accession_diff_analyzer.utils_analyzer import UtilsAnalyzer
+from compound_common.argparse_classes.parsers import ArgParsers
 
 
 def main(args):
-    parser = argparse.ArgumentParser()
-    parser.add_argument("-t", "--token", help="MetaboLights API Token")
-    parser.add_argument("-s", "--study-root", help="Absolute path to study root")
+    parser = ArgParsers.utils_accession_diff_parser()
     p_args = parser.parse_args(args)
     token = p_args.token
     study_root = p_args.study_root
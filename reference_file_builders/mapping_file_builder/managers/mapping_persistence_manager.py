@@ -1,4 +1,3 @@
-import datetime
 import json
 import pickle
 from typing import Union, Tuple, Any
@@ -23,19 +22,19 @@ class PickleClient:
         self.timers_enabled = timers_enabled
 
     def save(self, obj, filename) -> Union[None, Timer]:
-        timer = Timer(datetime.datetime.now()) if self.timers_enabled else None
+        timer = Timer() if self.timers_enabled else None
         with open(f"{self.root}/{filename}.pickle", "wb") as f:
             pickle.dump(obj, f)
             if timer is not None:
-                timer.end = datetime.datetime.now()
+                timer.stop()
         return timer
 
     def load(self, filename) -> Tuple[Any, Union[None, Timer]]:
-        timer = Timer(datetime.datetime.now()) if self.timers_enabled else None
+        timer = Timer() if self.timers_enabled else None
         with open(f"{self.root}/{filename}.pickle", "rb") as f:
             file = pickle.load(f)
             if timer is not None:
-                timer.end = datetime.datetime.now()
+                timer.stop()
                 return file, timer
             return file
 
@@ -46,19 +45,19 @@ class VanillaJsonClient:
         self.timers_enabled = timers_enabled
 
     def save(self, obj, filename) -> Union[None, Timer]:
-        timer = Timer(datetime.datetime.now()) if self.timers_enabled else None
+        timer = Timer() if self.timers_enabled else None
         with open(f"{self.root}/{filename}.json", "w") as f:
             json.dump(obj, f)
             if timer is not None:
-                timer.end = datetime.datetime.now()
+                timer.stop()
         return timer
 
     def load(self, filename) -> Tuple[Any, Union[None, Timer]]:
-        timer = Timer(datetime.datetime.now()) if self.timers_enabled else None
+        timer = Timer() if self.timers_enabled else None
         with open(f"{self.root}/{filename}.json", "r") as f:
             file = json.load(f)
             if timer is not None:
-                timer.end = datetime.datetime.now()
+                timer.stop()
                 return file, timer
             return file
 
@@ -69,20 +68,20 @@ class MessagePackClient:
         self.timers_enabled = timers_enabled
 
     def save(self, obj, filename) -> Union[None, Timer]:
-        timer = Timer(datetime.datetime.now()) if self.timers_enabled else None
+        timer = Timer() if self.timers_enabled else None
         packed = msgpack.packb(obj)
         with open(f"{self.root}/{filename}.bin", "wb") as f:
             f.write(packed)
             if timer is not None:
-                timer.end = datetime.datetime.now()
+                timer.stop()
         return timer
 
     def load(self, filename) -> Tuple[Any, Union[None, Timer]]:
-        timer = Timer(datetime.datetime.now()) if self.timers_enabled else None
+        timer = Timer() if self.timers_enabled else None
         with open(f"{self.root}/{filename}.bin", "rb") as f:
             bin = f.read()
             unpacked = msgpack.unpackb(bin)
             if timer is not None:
-                timer.end = datetime.datetime.now()
+                timer.stop()
                 return unpacked, timer
             return unpacked
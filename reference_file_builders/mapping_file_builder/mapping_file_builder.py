@@ -1,6 +1,5 @@
 import argparse
 import concurrent.futures
-import datetime
 import sys
 from dataclasses import asdict
 from typing import List
@@ -28,7 +27,7 @@ def build(config: MappingFileBuilderConfig):
     config = config
     session = requests.Session()
     master_mapping = RefMapping({}, {}, [])
-    overall_process_timer = Timer(datetime.datetime.now(), None)
+    overall_process_timer = Timer()
     mpm = MappingPersistenceManager(root=config.destination, timers_enabled=True)
 
     studies_list = session.get(config.mtbls_ws.metabolights_ws_studies_list).json()[
@@ -51,7 +50,7 @@ def build(config: MappingFileBuilderConfig):
 
     print(f"Saving mapping file using {config.pers.name} as persistence medium.")
     mpm.__getattribute__(config.pers.name).save(asdict(master_mapping), "mapping")
-    overall_process_timer.end = datetime.datetime.now()
+    overall_process_timer.stop()
     print(
         f"Overall, the reference file building process took {str(overall_process_timer.delta())}"
     )
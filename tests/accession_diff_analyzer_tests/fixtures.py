@@ -0,0 +1,23 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from accession_diff_analyzer.analyzer import Analyzer
+
+
+@pytest.fixture
+def analyzer_fixture():
+    # a MagicMock handler isn't an EBIFTPHandler, so the maf processor uses it directly rather than pooling
+    analyzer = Analyzer(session=MagicMock(), handler=MagicMock(), token="blerg")
+    yield analyzer
+    del analyzer
+
+
+@pytest.fixture
+def chebi_complete_entity():
+    response = MagicMock()
+    response.text = (
+        "CHEBI:16449alanineAn alpha-amino acid that consists of propionic acid bearing an amino "
+        "substituent at position 2."
+    )
+    yield response
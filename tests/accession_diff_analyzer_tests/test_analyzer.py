@@ -0,0 +1,77 @@
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+from compound_common.doc_clients.xml_utils import XmlResponseUtils
+
+from tests.accession_diff_analyzer_tests.fixtures import (
+    analyzer_fixture,
+    chebi_complete_entity,
+)
+
+
+class TestAnalyzer:
+    """
+    All whatever_fixture seen in test function arguments can be found in accession_diff_analyzer_tests/fixtures.py
+    """
+
+    def test_is_primary_cached(self, analyzer_fixture, chebi_complete_entity):
+        """
+        It should only hit the webservice once for a given ID, and return the cached result after.
+        """
+        analyzer_fixture.session.get.return_value = chebi_complete_entity
+
+        with patch.object(XmlResponseUtils, "get_chebi_id", return_value="CHEBI:16449") as fake_chebi_get:
+            assert analyzer_fixture.is_primary("CHEBI:16449") is True
+            assert analyzer_fixture.is_primary("CHEBI:16449") is True
+
+        assert fake_chebi_get.call_count == 1
+        assert analyzer_fixture.session.get.call_count == 1
+
+    def test_process_identifier(self, analyzer_fixture):
+        """
+        It should return every CHEBI id in an entry, with duds cast aside, and an empty list for numbers and anything
+        else that isn't a CHEBI id. Nothing should be added to the ids set directly.
+        """
+        assert analyzer_fixture.process_identifier("CHEBI:123|CHEBI:456|CHEBI:789") == [
+            "CHEBI:123", "CHEBI:456", "CHEBI:789"
+        ]
+        assert analyzer_fixture.process_identifier("unknown|CHEBI:123|unknown") == ["CHEBI:123"]
+        assert analyzer_fixture.process_identifier("CHEBI:15377") == ["CHEBI:15377"]
+        assert analyzer_fixture.process_identifier(0.0) == []
+        assert analyzer_fixture.process_identifier(1) == []
+        assert analyzer_fixture.process_identifier("chemistry") == []
+        assert analyzer_fixture.ids == set()
+
+    def test_process_maf_updates_ids_once(self, analyzer_fixture):
+        """
+        It should collect the CHEBI ids of a whole sheet and add them to the ids set in a single update, skipping duds.
+        """
+        analyzer_fixture.ids = MagicMock()
+        maf = pd.DataFrame({"database_identifier": ["CHEBI:15377", "unknown", "CHEBI:16449", "-", "HMDB0000001"]})
+
+        analyzer_fixture.process_maf(maf)
+
+        analyzer_fixture.ids.update.assert_called_once_with(["CHEBI:15377", "CHEBI:16449"])
+
+    def test_get_delta(self, analyzer_fixture):
+        """
+        It should return, as a set, exactly the ids in the subject that are not in the comparator.
+        """
+        subject = {"12345", "67890", "81818", "20010"}
+        comparator = {"12345", "67890", "81818", "00000", "11111"}
+        assert analyzer_fixture.get_delta(subject, comparator) == {"20010"}
+        assert analyzer_fixture.get_delta({"12345", "67890"}, {"12345", "67890"}) == set()
+
+    def test_dataframe_maf_processor_updates_shared_ids(self, analyzer_fixture):
+        """
+        It should add the plain CHEBI ids of a sheet to the Analyzer's own ids set, skipping duds, NaN and numbers.
+        """
+        maf = pd.DataFrame(
+            {"database_identifier": ["CHEBI:15377", "unknown", "-", " ", float("nan"), 12.0, "unknownId"]}
+        )
+
+        analyzer_fixture.maf_processor.process_maf(maf)
+
+        assert analyzer_fixture.maf_processor.ids is analyzer_fixture.ids
+        assert analyzer_fixture.ids == {"CHEBI:15377"}
@@ -0,0 +1,34 @@
+import re
+
+import pandas as pd
+import pytest
+
+from accession_diff_analyzer.utils_analyzer import MAFBreakdown, UtilsAnalyzer
+
+DUD_RE = re.compile("|".join(map(re.escape, ["|", "unknown", "Unknown", "-", " "])))
+
+
+class TestClassifyMaf:
+    def test_numeric_identifiers_are_alternate(self):
+        """
+        It should count anything Compound.isnumber accepts as an alternate identifier, including 'nan' and '1_000'
+        which float() parses, AND still sort chebi, empty, dud and alternate identifiers as before.
+        """
+        maf = pd.DataFrame(
+            {"database_identifier": ["nan", "NaN", "1_000", "Infinity", "12", "CHEBI:15377", "", "unknown", "HMDB01"]}
+        )
+        breakdown = UtilsAnalyzer.classify_maf(maf, MAFBreakdown(study_id="MTBLS1"), DUD_RE)
+
+        assert [c.database_identifier for c in breakdown.alternate] == [
+            "nan", "NaN", "1_000", "Infinity", "12", "HMDB01"
+        ]
+        assert [c.database_identifier for c in breakdown.chebi] == ["CHEBI:15377"]
+        assert len(breakdown.no_id) == 2
+
+    def test_unexpected_identifier(self):
+        """
+        It should raise a ValueError for an identifier that fits none of the categories.
+        """
+        maf = pd.DataFrame({"database_identifier": ["not_an_id!"]})
+        with pytest.raises(ValueError):
+            UtilsAnalyzer.classify_maf(maf, MAFBreakdown(study_id="MTBLS1"), DUD_RE)
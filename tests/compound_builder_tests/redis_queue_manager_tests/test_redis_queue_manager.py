@@ -20,11 +20,11 @@ class TestCompoundRedisQueueManager:
         crqm_fixt.redis_client.check_queue_exists = MagicMock(return_value={"items": 0})
 
         crqm_fixt.get_compounds_ids = MagicMock(return_value=[])
-        ListUtils.get_lol = MagicMock(return_value=[])
+        ListUtils.iter_lol = MagicMock(return_value=[])
         crqm_fixt.populate_queue()
 
         assert crqm_fixt.get_compounds_ids.call_count == 1
-        assert ListUtils.get_lol.call_count == 1
+        assert ListUtils.iter_lol.call_count == 1
 
     @patch("builtins.print")
     def test_populate_queue_sad(self, mock_print, compound_redis_queue_manager_fixture):
@@ -33,11 +33,11 @@ class TestCompoundRedisQueueManager:
         crqm_fixt.redis_client.check_queue_exists = MagicMock(return_value={"items": 1})
 
         crqm_fixt.get_compounds_ids = MagicMock()
-        ListUtils.get_lol = MagicMock()
+        ListUtils.iter_lol = MagicMock()
         crqm_fixt.populate_queue()
 
         assert crqm_fixt.get_compounds_ids.call_count == 0
-        assert ListUtils.get_lol.call_count == 0
+        assert ListUtils.iter_lol.call_count == 0
         mock_print.assert_called_once_with(
             "Queue populated. Risk of duplication. Aborting."
         )
@@ -77,15 +77,17 @@ class TestCompoundRedisQueueManager:
         """
         crqm_fixt = compound_redis_queue_manager_fixture
         crqm_fixt.redis_client = MagicMock()
-        crqm_fixt.redis_client.push_to_queue = MagicMock(return_value=1)
+        pushed = []
+        crqm_fixt.redis_client.push_many = MagicMock(
+            side_effect=lambda name, payloads: [pushed.append(p) or 1 for p in payloads]
+        )
         dumped = json.dumps(compound_list_fixture)
 
         crqm_fixt.push_compound_ids_to_redis([compound_list_fixture])
 
         mock_print.assert_called_once_with("Pushed sublist 0 to queue")
-        crqm_fixt.redis_client.push_to_queue.assert_called_once_with(
-            "compounds", dumped
-        )
+        assert crqm_fixt.redis_client.push_many.call_args[0][0] == "compounds"
+        assert pushed == [dumped]
 
     @patch("builtins.print")
     def test_push_compound_ids_to_redis_sad(
@@ -98,20 +100,21 @@ class TestCompoundRedisQueueManager:
         """
         crqm_fixt = compound_redis_queue_manager_fixture
         crqm_fixt.redis_client = MagicMock()
-        crqm_fixt.redis_client.push_to_queue = MagicMock(return_value=None)
+        pushed = []
+        crqm_fixt.redis_client.push_many = MagicMock(
+            side_effect=lambda name, payloads: [pushed.append(p) for p in payloads]
+        )
         dumped = json.dumps(compound_list_fixture)
 
         crqm_fixt.push_compound_ids_to_redis([])
 
         mock_print.assert_not_called()
-        crqm_fixt.redis_client.push_to_queue.assert_not_called()
+        assert pushed == []
 
         crqm_fixt.push_compound_ids_to_redis([compound_list_fixture])
 
         mock_print.assert_called_once_with("Unable to push sublist 0 to compound queue")
-        crqm_fixt.redis_client.push_to_queue.assert_called_once_with(
-            "compounds", dumped
-        )
+        assert pushed == [dumped]
 
     def test_consume_queue(
         self, compound_redis_queue_manager_fixture, compound_list_fixture
@@ -0,0 +1,50 @@
+from unittest.mock import patch
+
+from compound_library_builder.threaded_api_caller.sorter import ExternalAPIResultSorter
+
+
+class TestExternalAPIResultSorter:
+    @staticmethod
+    def compound_dict() -> dict:
+        return {
+            "id": "MTBLC15377",
+            "flags": {"hasLiterature": "false", "hasReactions": "false", "hasMS": "false"},
+            "pathways": {"WikiPathways": {}, "KEGGPathways": {}, "ReactomePathways": {}},
+            "spectra": {"NMR": [], "MS": []},
+        }
+
+    @patch("builtins.print")
+    def test_sort(self, mock_print):
+        """
+        It should hand each api's results to its handler, AND treat an api missing from the results (because it was
+        disabled) as having no results.
+        """
+        mementos = {
+            "cactus": "structure",
+            "citations": [{"source": "PMC"}],
+            "reactions": [{"id": "RHEA:1"}],
+            "wikipathways": {},
+        }
+
+        result = ExternalAPIResultSorter(mementos).sort(self.compound_dict())
+
+        assert result["structure"] == "structure"
+        assert result["citations"] == [{"source": "PMC"}]
+        assert result["flags"]["hasLiterature"] == "true"
+        assert result["reactions"] == [{"id": "RHEA:1"}]
+        assert result["flags"]["hasReactions"] == "true"
+        assert result["spectra"]["MS"] == []
+        assert result["pathways"]["KEGGPathways"] == {}
+        assert result["pathways"]["WikiPathways"] == {}
+
+    @patch("builtins.print")
+    def test_sort_no_results(self, mock_print):
+        """
+        With nothing from any api, every field should get its empty value.
+        """
+        result = ExternalAPIResultSorter({}).sort(self.compound_dict())
+
+        assert result["structure"] == "NA"
+        assert result["citations"] == []
+        assert result["flags"]["hasReactions"] == "false"
+        assert "reactions" not in result
@@ -0,0 +1,21 @@
+from compound_library_builder.ancillary_classes.spectra_file_handler import _parse_spectrum
+
+
+class TestSpectraFileHandler:
+    def test_parse_spectrum(self):
+        """
+        It should parse each mz:intensity datapoint into a peak, scaling and flooring the intensity,
+        AND record the lowest and highest mz.
+        """
+        result = _parse_spectrum("1234", "120.5:100 89.25:50.5  301.125:0")
+
+        assert result == {
+            "spectrumId": "1234",
+            "peaks": [
+                {"intensity": 999.0, "mz": 120.5},
+                {"intensity": 504.495, "mz": 89.25},
+                {"intensity": 0.0, "mz": 301.125},
+            ],
+            "mzStart": 89.25,
+            "mzStop": 301.125,
+        }
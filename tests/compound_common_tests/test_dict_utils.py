@@ -0,0 +1,18 @@
+from compound_common.dict_utils import DictUtils
+
+
+class TestDictUtils:
+    def test_dig(self):
+        data = {"names": {"SYNONYM": [{"name": "water"}], "IUPAC NAME": None}, "charge": 0}
+        assert DictUtils.dig(data, "names", "SYNONYM") == [{"name": "water"}]
+        assert DictUtils.dig(data, "charge") == 0
+
+    def test_dig_default(self):
+        """
+        It should hand back the default rather than raising for missing keys, None values or non-dicts on the path.
+        """
+        data = {"names": {"SYNONYM": [{"name": "water"}], "IUPAC NAME": None}, "charge": 0}
+        assert DictUtils.dig(data, "names", "IUPAC NAME", default=[]) == []
+        assert DictUtils.dig(data, "chemical_data", "formula") is None
+        assert DictUtils.dig(data, "names", "SYNONYM", "name", default="N/A") == "N/A"
+        assert DictUtils.dig(None, "names", default={}) == {}
@@ -0,0 +1,29 @@
+import os
+import time
+
+from compound_common.disk_cache import DiskCache
+
+
+class TestDiskCache:
+    def test_set_and_get(self, tmp_path):
+        """
+        It should give back what was cached under a key, AND the default for a key that was never cached.
+        """
+        cache = DiskCache(str(tmp_path / "cache"))
+        cache.set("CHEBI:15377", {"name": "water", "ids": [1, 2]})
+
+        assert cache.get("CHEBI:15377") == {"name": "water", "ids": [1, 2]}
+        assert cache.get("CHEBI:1") is None
+        assert cache.get("CHEBI:1", default={}) == {}
+        assert [name for name in os.listdir(tmp_path / "cache") if name.endswith(".tmp")] == []
+
+    def test_expired_entry(self, tmp_path):
+        """
+        An entry older than the ttl should be treated as missing.
+        """
+        cache = DiskCache(str(tmp_path), ttl=60)
+        cache.set("CHEBI:15377", {"name": "water"})
+        stale = time.time() - 120
+        os.utime(cache._path("CHEBI:15377"), (stale, stale))
+
+        assert cache.get("CHEBI:15377") is None
@@ -0,0 +1,17 @@
+from requests.exceptions import RetryError
+
+from compound_common.function_wrappers.builder_wrappers.http_exception_angel import http_exception_angel
+
+
+class TestHttpExceptionAngel:
+    def test_swallows_retry_error(self):
+        """
+        It should catch a RetryError, as raised once a pooled session's retries run out, and return None rather than
+        letting it stop the compound build.
+        """
+
+        @http_exception_angel
+        def get_reactions():
+            raise RetryError("Max retries exceeded with url: /rhea (Caused by ResponseError('too many 503 responses'))")
+
+        assert get_reactions() is None
@@ -0,0 +1,35 @@
+from compound_common.list_utils import ListUtils
+
+
+class TestListUtils:
+    def test_get_lol(self):
+        """
+        It should chunk a list into sublists of the given size, with any remainder in a final, shorter sublist.
+        """
+        master_list = [f"MTBLS{i}" for i in range(7)]
+        assert ListUtils.get_lol(master_list, 3) == [
+            ["MTBLS0", "MTBLS1", "MTBLS2"],
+            ["MTBLS3", "MTBLS4", "MTBLS5"],
+            ["MTBLS6"],
+        ]
+        assert ListUtils.get_lol(master_list[:6], 3) == [master_list[:3], master_list[3:6]]
+
+    def test_get_lol_short_list(self):
+        """
+        A list shorter than the chunk size should come back as a single chunk, rather than blowing up.
+        """
+        assert ListUtils.get_lol(["MTBLS1", "MTBLS2"], 10) == [["MTBLS1", "MTBLS2"]]
+        assert ListUtils.get_lol([], 10) == []
+
+    def test_iter_lol_matches_get_lol(self):
+        master_list = [f"MTBLS{i}" for i in range(25)]
+        for count in (1, 4, 5, 30):
+            assert list(ListUtils.iter_lol(master_list, count)) == ListUtils.get_lol(master_list, count)
+
+    def test_get_delta(self):
+        """
+        It should return the ids only found in the webservice list, once each, in webservice order.
+        """
+        webservice_list = ["MTBLC3", "MTBLC1", "MTBLC2", "MTBLC3", "MTBLC4"]
+        filesystem_list = ["MTBLC2", "MTBLC5"]
+        assert ListUtils.get_delta(webservice_list, filesystem_list) == ["MTBLC3", "MTBLC1", "MTBLC4"]
@@ -0,0 +1,39 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from compound_common.session_utils import SessionUtils
+
+
+class _AlwaysUnavailable(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(503)
+        self.send_header("Content-Type", "text/html")
+        self.end_headers()
+        self.wfile.write(b"<html>Service Unavailable</html>")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def unavailable_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _AlwaysUnavailable)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+class TestSessionUtils:
+    def test_pooled_session_returns_last_5xx(self, unavailable_url):
+        """
+        It should hand back the final 503 response once the retries are used up, rather than raising a RetryError.
+        """
+        session = SessionUtils.pooled_session(retries=1)
+        response = session.get(unavailable_url)
+
+        assert response.status_code == 503
+        assert response.text == "<html>Service Unavailable</html>"
@@ -0,0 +1,49 @@
+from compound_common.doc_clients.xml_utils import XmlResponseUtils
+
+
+class TestXmlResponseUtils:
+    def test_element_to_dict_leaf(self):
+        """
+        An element with no children should be returned as its text.
+        """
+        element = XmlResponseUtils.convert_to_element("<a>text</a>")
+        assert XmlResponseUtils.element_to_dict(element) == "text"
+
+    def test_element_to_dict_nested(self):
+        """
+        Nested elements should be returned as nested dicts, with repeated tags collected into a list in document order.
+        """
+        element = XmlResponseUtils.convert_to_element(
+            "<?xml version='1.0' encoding='UTF-8'?>"
+            "<root><a>1</a><b><c>2</c><c>3</c><d><e>x</e></d></b><a>4</a><a><z>q</z></a><f/></root>"
+        )
+        assert XmlResponseUtils.element_to_dict(element) == {
+            "a": ["1", "4", {"z": "q"}],
+            "b": {"c": ["2", "3"], "d": {"e": "x"}},
+            "f": None,
+        }
+
+    def test_get_chebi_id(self):
+        """
+        It should pull the chebiId out of a getCompleteEntity SOAP response, and return None if there isn't one.
+        """
+        response = (
+            '<?xml version="1.0" encoding="UTF-8"?>'
+            '<S:Envelope xmlns:S="http://schemas.xmlsoap.org/soap/envelope/"><S:Body>'
+            '<getCompleteEntityResponse xmlns="https://www.ebi.ac.uk/webservices/chebi"><return>'
+            "<chebiId>CHEBI:15377</chebiId><chebiAsciiName>water</chebiAsciiName>"
+            "</return></getCompleteEntityResponse></S:Body></S:Envelope>"
+        )
+        assert XmlResponseUtils.get_chebi_id(response) == "CHEBI:15377"
+        assert XmlResponseUtils.get_chebi_id(response.replace("chebiId", "chebiName")) is None
+
+    def test_get_chebi_id_stops_early(self):
+        """
+        It should stop parsing once it has the chebiId, so anything after it in the response is never looked at.
+        """
+        response = (
+            '<S:Envelope xmlns:S="http://schemas.xmlsoap.org/soap/envelope/"><S:Body>'
+            '<getCompleteEntityResponse xmlns="https://www.ebi.ac.uk/webservices/chebi"><return>'
+            "<chebiId>CHEBI:15377</chebiId><Synonyms><data>never closed"
+        )
+        assert XmlResponseUtils.get_chebi_id(response) == "CHEBI:15377"
@@ -1,7 +1,7 @@
 import pytest
 
 from compound_common.transport_clients.redis.redis_client import RedisClient
-from compound_common.config_classes import RedisConfig
+from compound_common.config_classes import FTPConfig, RedisConfig
 
 
 @pytest.fixture
@@ -10,3 +10,8 @@ def redis_client_fixture():
     rc = RedisClient(redis_config)
     yield rc
     del rc
+
+
+@pytest.fixture
+def ftp_config_fixture():
+    yield FTPConfig(enabled=True, root="nohost", study="/studies/", user="anonymous", password="")
@@ -0,0 +1,70 @@
+import ftplib
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pytest
+
+from compound_common.transport_clients.ebi_ftp_handler import EBIFTPHandlerPool
+
+from tests.compound_common_tests.transport_client_tests.fixtures import (
+    ftp_config_fixture,
+)
+
+
+class TestEBIFTPHandlerPool:
+    @patch(
+        "compound_common.transport_clients.ebi_ftp_handler.EBIFTPHandler",
+        side_effect=lambda config: MagicMock(),
+    )
+    def test_handler_closed_after_ftp_error(self, mock_handler_class, ftp_config_fixture):
+        """
+        It should close a handler whose call raised an ftp error and never lend it out again, AND hand a healthy
+        handler back out to the next borrower rather than opening another connection.
+        """
+        pool = EBIFTPHandlerPool(config=ftp_config_fixture, size=2)
+
+        with pytest.raises(ftplib.error_temp):
+            with pool.handler() as broken:
+                raise ftplib.error_temp("421 Too many connections")
+        broken.close.assert_called_once()
+
+        with pool.handler() as healthy:
+            assert healthy is not broken
+        with pool.handler() as again:
+            assert again is healthy
+        healthy.close.assert_not_called()
+        assert mock_handler_class.call_count == 2
+
+    def test_load_isa_files(self, ftp_config_fixture):
+        """
+        It should map each filename to the dataframe loaded for it, AND never open more than size handlers however many
+        files are asked for.
+        """
+        in_flight = []
+        lock = threading.Lock()
+
+        def load_isa_file(isatab_file, study, usecols):
+            with lock:
+                in_flight.append(isatab_file)
+                assert len(in_flight) <= 2
+            time.sleep(0.01)
+            with lock:
+                in_flight.remove(isatab_file)
+            return pd.DataFrame({"file": [isatab_file], "study": [study]})
+
+        def new_handler(config):
+            handler = MagicMock()
+            handler.load_isa_file.side_effect = load_isa_file
+            return handler
+
+        files = [f"m_MTBLS1_{i}.tsv" for i in range(6)]
+        with patch(
+            "compound_common.transport_clients.ebi_ftp_handler.EBIFTPHandler", side_effect=new_handler
+        ) as mock_handler_class:
+            result = EBIFTPHandlerPool(config=ftp_config_fixture, size=2).load_isa_files("MTBLS1", files)
+
+        assert list(result) == files
+        assert all(result[file]["file"].tolist() == [file] for file in files)
+        assert mock_handler_class.call_count <= 2
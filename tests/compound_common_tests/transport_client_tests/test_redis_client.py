@@ -1,6 +1,11 @@
 import json
 from unittest.mock import MagicMock, patch
 
+import redis
+
+from compound_common.config_classes import RedisConfig
+from compound_common.transport_clients.redis.redis_client import RedisClient
+
 from tests.compound_common_tests.transport_client_tests.fixtures import (
     redis_client_fixture,
 )
@@ -35,6 +40,50 @@ class TestRedisClient:
             mock_logging.assert_called_once_with("Couldnt serialize payload: an error")
             assert rc.redis.lpush.call_count == 0
 
+    def test_push_to_queue_pre_serialized(self, redis_client_fixture):
+        """
+        It should push an already serialized payload as is, without serializing it again.
+        """
+        rc = redis_client_fixture
+        rc.redis.lpush = MagicMock(return_value=1)
+        payload = json.dumps(["MTBLC1", "MTBLC2"])
+
+        with patch("json.dumps") as mock_dumps:
+            result = rc.push_to_queue("compounds", payload, pre_serialized=True)
+
+        assert mock_dumps.call_count == 0
+        rc.redis.lpush.assert_called_once_with("compounds", payload)
+        assert result == 1
+
+    def test_push_many(self, redis_client_fixture):
+        """
+        It should send every payload down a pipeline, flushing it every chunk items,
+        AND give back one response per payload in order, with None for any that couldnt be serialized.
+        """
+        rc = redis_client_fixture
+        pipe = MagicMock()
+        pipe.execute = MagicMock(side_effect=[[1, 2], [3]])
+        rc.redis.pipeline = MagicMock()
+        rc.redis.pipeline.return_value.__enter__.return_value = pipe
+
+        result = rc.push_many("compounds", [["MTBLC1"], ["MTBLC2"], {"not", "serializable"}, ["MTBLC3"]], chunk=2)
+
+        assert result == [1, 2, None, 3]
+        assert pipe.lpush.call_count == 3
+        assert pipe.execute.call_count == 2
+        rc.redis.pipeline.assert_called_once_with(transaction=False)
+
+    def test_clients_share_connection_pool(self, redis_client_fixture):
+        """
+        Clients pointed at the same server should share a connection pool, AND clients pointed elsewhere should not.
+        """
+        rc = redis_client_fixture
+        same = RedisClient(RedisConfig(db=0, port=123, host="nohost", decode_responses=False))
+        other = RedisClient(RedisConfig(db=1, port=123, host="nohost", decode_responses=False))
+
+        assert same.redis.connection_pool is rc.redis.connection_pool
+        assert other.redis.connection_pool is not rc.redis.connection_pool
+
     def test_check_queue_exists(self, redis_client_fixture):
         """
         The client should tell us a queue exists by using pythons redis interface and returning the info in a dict
@@ -78,6 +127,35 @@ class TestRedisClient:
         result = rc.consume_queue("compounds")
         assert result == ["MTBLC12345"]
 
+    def test_consume_many(self, redis_client_fixture):
+        """
+        It should pop up to count items with a single LPOP and return them in deserialised form.
+        """
+        rc = redis_client_fixture
+        rc.redis.lpop = MagicMock(return_value=[json.dumps(["MTBLC1"]), json.dumps(["MTBLC2"])])
+
+        result = rc.consume_many("compounds", 5)
+
+        assert result == [["MTBLC1"], ["MTBLC2"]]
+        rc.redis.lpop.assert_called_once_with("compounds", 5)
+
+    def test_consume_many_old_server(self, redis_client_fixture):
+        """
+        If the server doesnt support LPOP with a count, it should fall back to a pipeline of LPOPs
+        AND skip the Nones from once the queue ran dry.
+        """
+        rc = redis_client_fixture
+        rc.redis.lpop = MagicMock(side_effect=redis.exceptions.ResponseError("wrong number of arguments"))
+        pipe = MagicMock()
+        pipe.execute = MagicMock(return_value=[json.dumps(["MTBLC1"]), None, None])
+        rc.redis.pipeline = MagicMock()
+        rc.redis.pipeline.return_value.__enter__.return_value = pipe
+
+        result = rc.consume_many("compounds", 3)
+
+        assert result == [["MTBLC1"]]
+        assert pipe.lpop.call_count == 3
+
     @patch("builtins.print")
     def test_consume_queue(self, mock_print, redis_client_fixture):
         """
@@ -174,12 +174,14 @@ class TestChecker:
         assert fake_chebi_get.call_count == 1
         assert result is True
 
+        checker_fixture._is_primary_cache.clear()
         fake_chebi_get.return_value = "CHEBI:16450"
         result = checker_fixture.is_primary(id)
 
         assert fake_chebi_get.call_count == 2
         assert result is False
 
+        checker_fixture._is_primary_cache.clear()
         fake_chebi_get.return_value = None
         result = checker_fixture.is_primary(id)
 
@@ -187,16 +189,16 @@ class TestChecker:
         assert result is None
 
     def test_get_delta(self, checker_fixture):
-        """Test the get_delta method by making sure the exact list we expect is returned in each scenario"""
+        """Test the get_delta method by making sure the exact set we expect is returned in each scenario"""
         subject = {"12345", "67890", "81818", "20010"}
         comparator = {"12345", "67890", "81818", "00000", "11111"}
         result = checker_fixture.get_delta(subject, comparator)
-        assert result == ["20010"]
+        assert result == {"20010"}
 
         subject_two = {"12345", "67890"}
         comparator_two = {"12345", "67890"}
         result = checker_fixture.get_delta(subject_two, comparator_two)
-        assert result == []
+        assert result == set()
 
     def test_process_maf_none(self, checker_fixture):
         """Test the process_maf method by giving it a None, which should cause it to halt immediately and therefore make
@@ -209,41 +211,39 @@ class TestChecker:
         """Test the process_maf method by giving it the good_dataframe fixture, therefore meaning the dataframe is
         iterated over, and its database_identifer entry used as an argument in process_identifier
         """
-        checker_fixture.process_identifier = MagicMock()
+        checker_fixture.process_identifier = MagicMock(return_value=["CHEBI:12345"])
         checker_fixture.process_maf(good_dataframe)
         assert checker_fixture.process_identifier.call_count == 1
+        assert checker_fixture.ids == {"CHEBI:12345"}
 
     def test_process_identifier_float_and_int(self, checker_fixture):
-        """Test the process_identifier method by giving it a float and an int, and expecting neither to be added to the
-        Checkers ids set."""
+        """Test the process_identifier method by giving it a float and an int, and expecting neither to be returned as
+        a CHEBI id."""
         identifier = 0.0
-        checker_fixture.process_identifier(identifier)
-        assert len(checker_fixture.ids) == 0
+        assert checker_fixture.process_identifier(identifier) == []
 
         identifier = 1
-        checker_fixture.process_identifier(identifier)
-        assert len(checker_fixture.ids) == 0
+        assert checker_fixture.process_identifier(identifier) == []
 
     def test_process_identifier_multiple_chebi_ids(self, checker_fixture):
         """Test the process_identifier method by giving it an identifier with multiple chebi IDs, and expecting each ID
-        to be added to the Checkers ids set."""
+        to be returned."""
         identifier = "CHEBI:123|CHEBI:456|CHEBI:789"
-        checker_fixture.process_identifier(identifier)
-        assert len(checker_fixture.ids) == 3
+        result = checker_fixture.process_identifier(identifier)
+        assert result == ["CHEBI:123", "CHEBI:456", "CHEBI:789"]
 
     def test_process_identifier_multiple_chebi_ids_with_duds(self, checker_fixture):
         """Test the process_identifier method by giving it an identifier with multiple chebi IDs and expecting each
-        legitimate ID to be added to the Checkers ids set, with the duds cast aside."""
+        legitimate ID to be returned, with the duds cast aside."""
         identifier = "unknown|CHEBI:123|unknown"
-        checker_fixture.process_identifier(identifier)
-        assert len(checker_fixture.ids) == 1
+        result = checker_fixture.process_identifier(identifier)
+        assert result == ["CHEBI:123"]
 
     def test_process_identifier_unexpected(self, checker_fixture):
-        """Test the process_identifier method by giving it an unexpected string that should not be added to the Checkers
-        ids set."""
+        """Test the process_identifier method by giving it an unexpected string that should not be returned as a CHEBI
+        id."""
         identifier = "chemistry"
-        checker_fixture.process_identifier(identifier)
-        assert len(checker_fixture.ids) == 0
+        assert checker_fixture.process_identifier(identifier) == []
 
     def test_is_dud(self, checker_fixture):
         """Test the is_dud method by giving it a bunch of duds and expecting it to say they are all duds."""
@@ -1,10 +1,16 @@
-import errno
 import json
+import logging
 import os
 from typing import Any
 
 import yaml
 
+try:
+    # orjson serializes the large compound and spectra dicts several times faster than the json module
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class GeneralFileUtils:
     """
@@ -14,28 +20,28 @@ class GeneralFileUtils:
     @staticmethod
     def save_json_file(filename: str, data: dict) -> None:
         """
-        Dump a given dict as a .json file. Check first that the directory we want to save to exists, and if it doesn't,
-        create it.
+        Dump a given dict as a .json file. The directory we want to save to is created if it doesn't already
+        exist. Uses orjson if it is installed, and falls back to the json module if not.
+        Progress is logged at debug level, as this is called once per compound and spectrum file.
         :param filename: string representation of the full path of the .json file to be.
         :param data: dict to be saved as a .json file
         :return: None
         """
-        print(f"Attempting to save {filename}")
-        if not os.path.exists(os.path.dirname(filename)):
-            try:
-                os.makedirs(os.path.dirname(filename))
-            except OSError as exc:
-                if exc.errno != errno.EEXIST:
-                    raise
-        with open(filename, "w") as fp:
-            try:
-                json.dump(data, fp)
-            except json.decoder.JSONDecodeError as e:
-                print("what the hell " + str(e))
-        if os.path.exists(filename):
-            print(f"Successfully saved {filename}")
+        logging.debug("Attempting to save %s", filename)
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if orjson is not None:
+            with open(filename, "wb") as fp:
+                fp.write(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
         else:
-            print(f"Failed to save {filename}")
+            with open(filename, "w") as fp:
+                try:
+                    json.dump(data, fp)
+                except json.decoder.JSONDecodeError as e:
+                    print("what the hell " + str(e))
+        # open / write raise if the file couldn't be saved, so getting here means it was
+        logging.debug("Successfully saved %s", filename)
 
     @staticmethod
     def open_yaml_file(path_to_yaml: str) -> Any: